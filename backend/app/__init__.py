@@ -3,6 +3,8 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_cors import CORS
 from dotenv import load_dotenv
+from app.utils.json_provider import FastJSONProvider
+from app.utils.logging_config import init_logging
 import os
 
 load_dotenv()
@@ -11,7 +13,13 @@ db = SQLAlchemy(session_options={"autoflush": False})
 migrate = Migrate()
 
 def create_app():
+    # Queue-backed logging for the "app" loggers (before Flask's app.logger is created)
+    init_logging()
+
     app = Flask(__name__)
+    app.json = FastJSONProvider(app)
+    # Raw UTF-8 instead of \uXXXX escapes, which lets orjson encode every response
+    app.json.ensure_ascii = False
     app.config["SQLALCHEMY_DATABASE_URI"] = os.getenv("DATABASE_URL")
     app.config["SQLALCHEMY_TRACK_MODIFICATIONS"] = False
 
@@ -21,7 +29,7 @@ def create_app():
         resources={
             r"/api/*": {
                 "origins": ["http://localhost:5173", "http://127.0.0.1:5173"],
-                "methods": ["GET", "POST", "PUT", "DELETE", "OPTIONS"],
+                "methods": ["GET", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"],
                 "allow_headers": ["Content-Type", "Authorization"],
                 "supports_credentials": True
             }
@@ -33,18 +41,27 @@ def create_app():
     def after_request(response):
         response.headers.add('Access-Control-Allow-Origin', 'http://localhost:5173')
         response.headers.add('Access-Control-Allow-Headers', 'Content-Type,Authorization')
-        response.headers.add('Access-Control-Allow-Methods', 'GET,PUT,POST,DELETE,OPTIONS')
+        response.headers.add('Access-Control-Allow-Methods', 'GET,PUT,PATCH,POST,DELETE,OPTIONS')
         response.headers.add('Access-Control-Allow-Credentials', 'true')
         return response
 
     db.init_app(app)
     migrate.init_app(app, db)
 
+    # Single authentication stage for all routes (CORS preflight answered first)
+    from app.firebase_auth import init_auth
+    init_auth(app)
+
+    # gzip/brotli for large responses
+    from app.utils.compression import init_compression
+    init_compression(app)
+
     # Import models so Flask-Migrate can detect them
     from app.models import user  
     from app.models import direct_request  
     from app.models import group
     from app.models import group_request
+    from app.models import compatibility
 
     # Register all controllers
     from app.controllers.user_controller import bp as user_bp
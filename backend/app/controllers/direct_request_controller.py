@@ -4,20 +4,24 @@ Handles direct study buddy requests between users.
 
 Routes:
 POST    /api/requests/                      - Send a new direct request to another user
-GET     /api/requests/incoming/             - Get all incoming direct requests for user
-GET     /api/requests/outgoing/             - Get all outgoing direct requests for user
+GET     /api/requests/incoming/             - Paginated incoming direct requests for user (?status=&limit=&cursor=&uids=)
+GET     /api/requests/outgoing/             - Paginated outgoing direct requests for user (?status=&limit=&cursor=&uids=)
 PUT     /api/requests/<id>/accept/          - Accept an incoming direct request and create private study group
 PUT     /api/requests/<id>/reject/          - Reject an incoming direct request
 DELETE  /api/requests/<id>/                 - Delete a direct request (sender or receiver)
 """
 
-from flask import Blueprint, request, jsonify
+import logging
+from flask import Blueprint, request, jsonify, g
 from app.repositories.direct_request_repo import DirectRequestRepo
 from app.repositories.user_repo import UserRepo
 from app.repositories.group_repo import GroupRepo
 from app.models.direct_request import RequestStatus
 from app.models.group import GroupPrivacy
-from app.firebase_auth import firebase_auth_required
+from app.utils.http_cache import conditional_response, json_etag, not_modified
+from app.utils.query_params import parse_uid_list
+
+logger = logging.getLogger(__name__)
 
 bp = Blueprint("direct_request", __name__, url_prefix="/api/requests")
 
@@ -25,26 +29,7 @@ bp = Blueprint("direct_request", __name__, url_prefix="/api/requests")
 @bp.route("/", methods=["POST", "OPTIONS"])
 def send_request():
     """Send a new direct request to another user"""
-    
-    # Handle preflight OPTIONS request
-    if request.method == "OPTIONS":
-        return "", 200
-
-    # Get and verify Firebase token
-    auth_header = request.headers.get("Authorization", "")
-    
-    if not auth_header.startswith("Bearer "):
-        return jsonify({"error": "Missing or invalid Authorization header"}), 401
-    
-    token = auth_header.split(" ", 1)[1]
-    
-    try:
-        from firebase_admin import auth as firebase_auth
-        decoded = firebase_auth.verify_id_token(token)
-        sender_uid = decoded.get("uid")
-        print(f"Token verified. Sender UID: {sender_uid}")
-    except Exception as e:
-        return jsonify({"error": f"Invalid or expired Firebase token: {str(e)}"}), 401
+    sender_uid = g.firebase_uid
 
     # Get request data
     data = request.get_json()
@@ -62,7 +47,7 @@ def send_request():
 
     try:
         direct_request = DirectRequestRepo.create_request(sender_uid, receiver_uid, message)
-        print("Direct Request sent successfully!")
+        logger.info("Direct request sent", extra={"receiver_uid": receiver_uid, "request_id": direct_request.id})
         
         return jsonify({
             "message": "Request sent successfully",
@@ -84,25 +69,7 @@ def send_request():
 @bp.route("/incoming/", methods=["GET", "OPTIONS"])
 def get_incoming_requests():
     """Get user's incoming direct requests"""
-    
-    # Handle preflight OPTIONS request
-    if request.method == "OPTIONS":
-        return "", 200
-    
-    # Get and verify Firebase token
-    auth_header = request.headers.get("Authorization", "")
-    
-    if not auth_header.startswith("Bearer "):
-        return jsonify({"error": "Missing or invalid Authorization header"}), 401
-    
-    token = auth_header.split(" ", 1)[1]
-    
-    try:
-        from firebase_admin import auth as firebase_auth
-        decoded = firebase_auth.verify_id_token(token)
-        user_uid = decoded.get("uid")
-    except Exception as e:
-        return jsonify({"error": f"Invalid or expired Firebase token: {str(e)}"}), 401
+    user_uid = g.firebase_uid
 
     try:
         # optional status filter from query params
@@ -114,23 +81,33 @@ def get_incoming_requests():
             except ValueError:
                 return jsonify({"error": f"Invalid status: {status_param}"}), 400
 
-        incoming_requests = DirectRequestRepo.get_user_incoming_requests(user_uid, status_filter)
-        
-        # add sender details to each request
-        enriched_requests = []
-        for req in incoming_requests:
-            sender = UserRepo.get_user(req.sender_uid)
-            enriched_requests.append({
-                "id": req.id,
-                "sender_uid": req.sender_uid,
-                "sender_username": sender["username"] if sender else "Unknown",
-                "message": req.message,
-                "status": req.status.value,
-                "created_at": req.created_at.isoformat(),
-                "updated_at": req.updated_at.isoformat()
-            })
-        
-        return jsonify({"requests": enriched_requests}), 200
+        try:
+            limit = int(request.args.get("limit", 50))
+        except ValueError:
+            return jsonify({"error": "limit must be an integer"}), 400
+        if limit < 1 or limit > 100:
+            return jsonify({"error": "limit must be between 1 and 100"}), 400
+        cursor = request.args.get("cursor")
+        try:
+            counterpart_uids = parse_uid_list()
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        # Answer revalidations from the version stamp before loading the list
+        version = DirectRequestRepo.get_incoming_version(user_uid, status_filter, counterpart_uids)
+        etag = json_etag(["incoming", user_uid, status_param, limit, cursor, counterpart_uids, version])
+        unchanged = not_modified(etag)
+        if unchanged:
+            return unchanged
+
+        try:
+            page = DirectRequestRepo.get_incoming_page(
+                user_uid, status_filter, limit=limit, cursor=cursor, counterpart_uids=counterpart_uids
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        return conditional_response(page, etag, private=True)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -138,25 +115,7 @@ def get_incoming_requests():
 @bp.route("/outgoing/", methods=["GET", "OPTIONS"])
 def get_outgoing_requests():
     """Get user's outgoing direct requests"""
-    
-    # Handle preflight OPTIONS request
-    if request.method == "OPTIONS":
-        return "", 200
-    
-    # Get and verify Firebase token
-    auth_header = request.headers.get("Authorization", "")
-    
-    if not auth_header.startswith("Bearer "):
-        return jsonify({"error": "Missing or invalid Authorization header"}), 401
-    
-    token = auth_header.split(" ", 1)[1]
-    
-    try:
-        from firebase_admin import auth as firebase_auth
-        decoded = firebase_auth.verify_id_token(token)
-        user_uid = decoded.get("uid")
-    except Exception as e:
-        return jsonify({"error": f"Invalid or expired Firebase token: {str(e)}"}), 401
+    user_uid = g.firebase_uid
 
     try:
         # optional status filter from query params
@@ -168,23 +127,33 @@ def get_outgoing_requests():
             except ValueError:
                 return jsonify({"error": f"Invalid status: {status_param}"}), 400
 
-        outgoing_requests = DirectRequestRepo.get_user_outgoing_requests(user_uid, status_filter)
-        
-        # add receiver details to each request
-        enriched_requests = []
-        for req in outgoing_requests:
-            receiver = UserRepo.get_user(req.receiver_uid)
-            enriched_requests.append({
-                "id": req.id,
-                "receiver_uid": req.receiver_uid,
-                "receiver_username": receiver["username"] if receiver else "Unknown",
-                "message": req.message,
-                "status": req.status.value,
-                "created_at": req.created_at.isoformat(),
-                "updated_at": req.updated_at.isoformat()
-            })
-        
-        return jsonify({"requests": enriched_requests}), 200
+        try:
+            limit = int(request.args.get("limit", 50))
+        except ValueError:
+            return jsonify({"error": "limit must be an integer"}), 400
+        if limit < 1 or limit > 100:
+            return jsonify({"error": "limit must be between 1 and 100"}), 400
+        cursor = request.args.get("cursor")
+        try:
+            counterpart_uids = parse_uid_list()
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        # Answer revalidations from the version stamp before loading the list
+        version = DirectRequestRepo.get_outgoing_version(user_uid, status_filter, counterpart_uids)
+        etag = json_etag(["outgoing", user_uid, status_param, limit, cursor, counterpart_uids, version])
+        unchanged = not_modified(etag)
+        if unchanged:
+            return unchanged
+
+        try:
+            page = DirectRequestRepo.get_outgoing_page(
+                user_uid, status_filter, limit=limit, cursor=cursor, counterpart_uids=counterpart_uids
+            )
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+
+        return conditional_response(page, etag, private=True)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -192,25 +161,7 @@ def get_outgoing_requests():
 @bp.route("/<int:request_id>/accept/", methods=["PUT", "OPTIONS"])
 def accept_request(request_id):
     """Accept an incoming direct request and create a private study group"""
-    
-    # Handle preflight OPTIONS request
-    if request.method == "OPTIONS":
-        return "", 200
-    
-    # Get and verify Firebase token
-    auth_header = request.headers.get("Authorization", "")
-    
-    if not auth_header.startswith("Bearer "):
-        return jsonify({"error": "Missing or invalid Authorization header"}), 401
-    
-    token = auth_header.split(" ", 1)[1]
-    
-    try:
-        from firebase_admin import auth as firebase_auth
-        decoded = firebase_auth.verify_id_token(token)
-        user_uid = decoded.get("uid")
-    except Exception as e:
-        return jsonify({"error": f"Invalid or expired Firebase token: {str(e)}"}), 401
+    user_uid = g.firebase_uid
 
     try:
         updated_request = DirectRequestRepo.update_request_status(
@@ -274,25 +225,7 @@ def accept_request(request_id):
 @bp.route("/<int:request_id>/reject/", methods=["PUT", "OPTIONS"])
 def reject_request(request_id):
     """Reject an incoming direct request"""
-    
-    # Handle preflight OPTIONS request
-    if request.method == "OPTIONS":
-        return "", 200
-    
-    # Get and verify Firebase token
-    auth_header = request.headers.get("Authorization", "")
-    
-    if not auth_header.startswith("Bearer "):
-        return jsonify({"error": "Missing or invalid Authorization header"}), 401
-    
-    token = auth_header.split(" ", 1)[1]
-    
-    try:
-        from firebase_admin import auth as firebase_auth
-        decoded = firebase_auth.verify_id_token(token)
-        user_uid = decoded.get("uid")
-    except Exception as e:
-        return jsonify({"error": f"Invalid or expired Firebase token: {str(e)}"}), 401
+    user_uid = g.firebase_uid
 
     try:
         updated_request = DirectRequestRepo.update_request_status(
@@ -321,25 +254,7 @@ def reject_request(request_id):
 @bp.route("/<int:request_id>/", methods=["DELETE", "OPTIONS"])
 def cancel_request(request_id):
     """Cancel/delete a direct request"""
-    
-    # Handle preflight OPTIONS request
-    if request.method == "OPTIONS":
-        return "", 200
-    
-    # Get and verify Firebase token
-    auth_header = request.headers.get("Authorization", "")
-    
-    if not auth_header.startswith("Bearer "):
-        return jsonify({"error": "Missing or invalid Authorization header"}), 401
-    
-    token = auth_header.split(" ", 1)[1]
-    
-    try:
-        from firebase_admin import auth as firebase_auth
-        decoded = firebase_auth.verify_id_token(token)
-        user_uid = decoded.get("uid")
-    except Exception as e:
-        return jsonify({"error": f"Invalid or expired Firebase token: {str(e)}"}), 401
+    user_uid = g.firebase_uid
 
     try:
         success = DirectRequestRepo.cancel_request(request_id, user_uid)
@@ -8,7 +8,7 @@ GET     /api/group-requests/group/<id>/             - Get all pending requests f
 POST    /api/group-requests/<id>/respond/           - Respond to a join request (admin only)
 GET     /api/group-requests/my-requests/            - Get all join requests created by current user
 """
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, g
 from app.repositories.group_request_repo import GroupRequestRepo
 
 bp = Blueprint("group_requests", __name__, url_prefix="/api/group-requests")
@@ -17,24 +17,7 @@ bp = Blueprint("group_requests", __name__, url_prefix="/api/group-requests")
 @bp.route("/", methods=["POST", "OPTIONS"])
 def create_join_request():
     """Create a join request for a group"""
-    
-    # Handle preflight OPTIONS request
-    if request.method == "OPTIONS":
-        return "", 200
-    
-    # Get and verify Firebase token
-    auth_header = request.headers.get("Authorization", "")
-    if not auth_header.startswith("Bearer "):
-        return jsonify({"error": "Missing or invalid Authorization header"}), 401
-    
-    token = auth_header.split(" ", 1)[1]
-    
-    try:
-        from firebase_admin import auth as firebase_auth
-        decoded = firebase_auth.verify_id_token(token)
-        requester_uid = decoded.get("uid")
-    except Exception as e:
-        return jsonify({"error": f"Invalid or expired Firebase token: {str(e)}"}), 401
+    requester_uid = g.firebase_uid
 
     # Get request data
     try:
@@ -70,24 +53,7 @@ def create_join_request():
 @bp.route("/group/<int:group_id>/", methods=["GET", "OPTIONS"])
 def get_group_pending_requests(group_id):
     """Get all pending join requests for a group (admin only)"""
-    
-    # Handle preflight OPTIONS request
-    if request.method == "OPTIONS":
-        return "", 200
-    
-    # Get and verify Firebase token
-    auth_header = request.headers.get("Authorization", "")
-    if not auth_header.startswith("Bearer "):
-        return jsonify({"error": "Missing or invalid Authorization header"}), 401
-    
-    token = auth_header.split(" ", 1)[1]
-    
-    try:
-        from firebase_admin import auth as firebase_auth
-        decoded = firebase_auth.verify_id_token(token)
-        admin_uid = decoded.get("uid")
-    except Exception as e:
-        return jsonify({"error": f"Invalid or expired Firebase token: {str(e)}"}), 401
+    admin_uid = g.firebase_uid
 
     try:
         # Verify admin permissions
@@ -105,24 +71,7 @@ def get_group_pending_requests(group_id):
 @bp.route("/<int:request_id>/respond/", methods=["POST", "OPTIONS"])
 def respond_to_request(request_id):
     """Admin responds to a join request (accept/reject)"""
-    
-    # Handle preflight OPTIONS request
-    if request.method == "OPTIONS":
-        return "", 200
-    
-    # Get and verify Firebase token
-    auth_header = request.headers.get("Authorization", "")
-    if not auth_header.startswith("Bearer "):
-        return jsonify({"error": "Missing or invalid Authorization header"}), 401
-    
-    token = auth_header.split(" ", 1)[1]
-    
-    try:
-        from firebase_admin import auth as firebase_auth
-        decoded = firebase_auth.verify_id_token(token)
-        admin_uid = decoded.get("uid")
-    except Exception as e:
-        return jsonify({"error": f"Invalid or expired Firebase token: {str(e)}"}), 401
+    admin_uid = g.firebase_uid
 
     # Get request data
     try:
@@ -151,24 +100,7 @@ def respond_to_request(request_id):
 @bp.route("/my-requests/", methods=["GET", "OPTIONS"])
 def get_my_pending_requests():
     """Get all pending requests sent by the current user"""
-    
-    # Handle preflight OPTIONS request
-    if request.method == "OPTIONS":
-        return "", 200
-    
-    # Get and verify Firebase token
-    auth_header = request.headers.get("Authorization", "")
-    if not auth_header.startswith("Bearer "):
-        return jsonify({"error": "Missing or invalid Authorization header"}), 401
-    
-    token = auth_header.split(" ", 1)[1]
-    
-    try:
-        from firebase_admin import auth as firebase_auth
-        decoded = firebase_auth.verify_id_token(token)
-        user_uid = decoded.get("uid")
-    except Exception as e:
-        return jsonify({"error": f"Invalid or expired Firebase token: {str(e)}"}), 401
+    user_uid = g.firebase_uid
 
     try:
         # Get user's pending requests
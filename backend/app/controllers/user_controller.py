@@ -7,43 +7,42 @@ POST    /api/users/                                 - Create a new user account
 GET     /api/users/me/                              - Get current user's profile
 GET     /api/users/enums/                           - Get available enum values for user fields
 GET     /api/users/check-username/<username>        - Check if username is available
+GET     /api/users/autocomplete/?prefix=            - Username prefix autocomplete
 PUT     /api/users/                                 - Update user profile
+PATCH   /api/users/                                 - Partially update profile fields (returns changed fields only)
+POST    /api/users/courses/                         - Add a single course enrollment
+DELETE  /api/users/courses/<course_id>/             - Remove a single course enrollment
 GET     /api/users/all/                             - Fetch all users endpoint for People Feed
+GET     /api/users/feed/                            - Ranked, paginated People Feed (?limit=&cursor=)
+GET     /api/users/search/?q=                       - Fuzzy username search (?q=&limit=&cursor=)
 """
 
 from flask import Blueprint, request, jsonify, g
 from flask_cors import cross_origin
 from datetime import datetime
 from app.repositories.user_repo import UserRepo
-from app.firebase_auth import firebase_auth_required
+from app.firebase_auth import public_route
 from app.models.user import Gender, Grade
+from app.utils.http_cache import conditional_response, json_etag
+from app.utils.msgpack_response import negotiated_response
+from sqlalchemy.exc import IntegrityError
 
 bp = Blueprint("user", __name__, url_prefix="/api/users")
 
+# Enum values only change with a deploy, so the payload and its ETag are built once
+ENUMS_PAYLOAD = {
+    "grades": [{"value": grade.value, "label": grade.value.replace("_", " ").title()} for grade in Grade],
+    "genders": [{"value": gender.value, "label": gender.value.replace("_", " ").title()} for gender in Gender]
+}
+ENUMS_ETAG = json_etag(ENUMS_PAYLOAD)
+ENUMS_MAX_AGE = 86400
+
 
 @bp.route("/", methods=["POST", "OPTIONS"])
 def create_user():
     """Create a new user - extracts UID from Firebase token for verification"""
-    
-    # Handle preflight OPTIONS request
-    if request.method == "OPTIONS":
-        return "", 200
-    
-    # Get and verify Firebase token 
-    auth_header = request.headers.get("Authorization", "")
-    
-    if not auth_header.startswith("Bearer "):
-        return jsonify({"error": "Missing or invalid Authorization header"}), 401
-    
-    token = auth_header.split(" ", 1)[1]
-    
-    try:
-        from firebase_admin import auth as firebase_auth
-        decoded = firebase_auth.verify_id_token(token)
-        firebase_uid = decoded.get("uid")
-        firebase_email = decoded.get("email")
-    except Exception as e:
-        return jsonify({"error": f"Invalid or expired Firebase token: {str(e)}"}), 401
+    firebase_uid = g.firebase_uid
+    firebase_email = g.firebase_email
 
     data = request.get_json()
     uid = data.get("uid")
@@ -101,6 +100,8 @@ def create_user():
     try:
         UserRepo.create_user_with_profile(uid, username, email, profile, courses)
         return jsonify({"message": "User created successfully"}), 201
+    except IntegrityError:
+        return jsonify({"error": f"Username '{username}' is already taken"}), 409
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -108,26 +109,7 @@ def create_user():
 @bp.route("/me/", methods=["GET", "OPTIONS"])
 def get_me():
     """Get current user's profile data"""
-    
-    # Handle preflight OPTIONS request
-    if request.method == "OPTIONS":
-        return "", 200
-    
-    # Get and verify Firebase token 
-    auth_header = request.headers.get("Authorization", "")
-    
-    if not auth_header.startswith("Bearer "):
-        return jsonify({"error": "Missing or invalid Authorization header"}), 401
-    
-    token = auth_header.split(" ", 1)[1]
-    
-    try:
-        from firebase_admin import auth as firebase_auth
-        decoded = firebase_auth.verify_id_token(token)
-        firebase_uid = decoded.get("uid")
-        firebase_email = decoded.get("email")
-    except Exception as e:
-        return jsonify({"error": f"Invalid or expired Firebase token: {str(e)}"}), 401
+    firebase_uid = g.firebase_uid
     
     try:
         # Get user profile data from database
@@ -141,30 +123,19 @@ def get_me():
 
 
 @bp.route("/enums/", methods=["GET", "OPTIONS"])
+@public_route
 def get_enums():
     """Get valid enum values for grade and gender fields"""
-    
-    # Handle preflight OPTIONS request
-    if request.method == "OPTIONS":
-        return "", 200
-    
     try:
-        return jsonify({
-            "grades": [{"value": grade.value, "label": grade.value.replace("_", " ").title()} for grade in Grade],
-            "genders": [{"value": gender.value, "label": gender.value.replace("_", " ").title()} for gender in Gender]
-        }), 200
+        return conditional_response(ENUMS_PAYLOAD, ENUMS_ETAG, max_age=ENUMS_MAX_AGE)
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
 
 @bp.route("/check-username/<username>", methods=["GET", "OPTIONS"])
+@public_route
 def check_username(username):
     """Check if username is available"""
-    
-    # Handle preflight OPTIONS request
-    if request.method == "OPTIONS":
-        return "", 200
-    
     try:
         is_taken = UserRepo.is_username_taken(username)
         return jsonify({
@@ -176,29 +147,29 @@ def check_username(username):
         return jsonify({"error": str(e)}), 500
 
 
+@bp.route("/autocomplete/", methods=["GET", "OPTIONS"])
+def autocomplete_usernames():
+    """Suggest usernames starting with the given prefix"""
+    prefix = request.args.get("prefix", "").strip()
+    if not prefix:
+        return jsonify({"usernames": []}), 200
+
+    try:
+        limit = min(max(int(request.args.get("limit", 10)), 1), 50)
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+
+    try:
+        return jsonify({"usernames": UserRepo.suggest_usernames(prefix, limit)}), 200
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
 @bp.route("/", methods=["PUT", "OPTIONS"])
 def update_user():
     """Update user profile including username"""
-    
-    # Handle preflight OPTIONS request
-    if request.method == "OPTIONS":
-        return "", 200
-    
-    # Get and verify Firebase token 
-    auth_header = request.headers.get("Authorization", "")
-    
-    if not auth_header.startswith("Bearer "):
-        return jsonify({"error": "Missing or invalid Authorization header"}), 401
-    
-    token = auth_header.split(" ", 1)[1]
-    
-    try:
-        from firebase_admin import auth as firebase_auth
-        decoded = firebase_auth.verify_id_token(token)
-        firebase_uid = decoded.get("uid")
-        firebase_email = decoded.get("email")
-    except Exception as e:
-        return jsonify({"error": f"Invalid or expired Firebase token: {str(e)}"}), 401
+    firebase_uid = g.firebase_uid
+    firebase_email = g.firebase_email
 
     # Get request data
     data = request.get_json()
@@ -246,6 +217,85 @@ def update_user():
     try:
         UserRepo.create_user_with_profile(firebase_uid, username, firebase_email, profile, courses)
         return jsonify({"message": "Profile updated successfully"}), 200
+    except IntegrityError:
+        return jsonify({"error": f"Username '{username}' is already taken"}), 409
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@bp.route("/", methods=["PATCH", "OPTIONS"])
+def patch_user():
+    """Partially update profile fields - only the provided fields are validated and written"""
+    firebase_uid = g.firebase_uid
+
+    data = request.get_json(silent=True) or {}
+    fields = {key: data[key] for key in ("username", "date_of_birth", "grade", "gender") if key in data}
+
+    if not fields:
+        return jsonify({"error": "Provide at least one of: username, date_of_birth, grade, gender"}), 400
+
+    if "username" in fields:
+        if not fields["username"]:
+            return jsonify({"error": "Username cannot be empty"}), 400
+        if UserRepo.is_username_taken(fields["username"], exclude_uid=firebase_uid):
+            return jsonify({"error": f"Username '{fields['username']}' is already taken"}), 409
+
+    if "date_of_birth" in fields:
+        try:
+            fields["date_of_birth"] = datetime.strptime(fields["date_of_birth"], "%Y-%m-%d").date()
+        except (TypeError, ValueError):
+            return jsonify({"error": "Invalid date_of_birth format, expected YYYY-MM-DD"}), 400
+
+    try:
+        changed = UserRepo.update_profile_fields(firebase_uid, fields)
+        if changed is None:
+            return jsonify({"error": "User profile not found"}), 404
+        return jsonify({"message": "Profile updated successfully", "updated": changed}), 200
+    except IntegrityError:
+        return jsonify({"error": "Username is already taken"}), 409
+    except ValueError as e:
+        return jsonify({
+            "error": str(e),
+            "valid_grades": [grade.value for grade in Grade],
+            "valid_genders": [gender.value for gender in Gender]
+        }), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@bp.route("/courses/", methods=["POST", "OPTIONS"])
+def add_course():
+    """Add a single course to the current user's enrollments"""
+    firebase_uid = g.firebase_uid
+
+    data = request.get_json(silent=True) or {}
+    course_id = data.get("course_id")
+    if not course_id:
+        return jsonify({"error": "course_id is required"}), 400
+
+    try:
+        added = UserRepo.add_course(firebase_uid, course_id)
+        if not added:
+            return jsonify({"message": "Already enrolled", "courses_added": []}), 200
+        return jsonify({"message": "Course added", "courses_added": [course_id]}), 201
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 404
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@bp.route("/courses/<course_id>/", methods=["DELETE", "OPTIONS"])
+def remove_course(course_id):
+    """Remove a single course from the current user's enrollments"""
+    firebase_uid = g.firebase_uid
+
+    try:
+        removed = UserRepo.remove_course(firebase_uid, course_id)
+        if not removed:
+            return jsonify({"error": "Not enrolled in this course"}), 404
+        return jsonify({"message": "Course removed", "courses_removed": [course_id]}), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
 
@@ -253,30 +303,62 @@ def update_user():
 @bp.route("/all/", methods=["GET", "OPTIONS"])
 def get_all_users():
     """Get all users for people feed (excluding current user)"""
-    
-    # Handle preflight OPTIONS request
-    if request.method == "OPTIONS":
-        return "", 200
-    
-    
-    # Get and verify Firebase token 
-    auth_header = request.headers.get("Authorization", "")
-    
-    if not auth_header.startswith("Bearer "):
-        return jsonify({"error": "Missing or invalid Authorization header"}), 401
-    
-    token = auth_header.split(" ", 1)[1]
-    
-    try:
-        from firebase_admin import auth as firebase_auth
-        decoded = firebase_auth.verify_id_token(token)
-        firebase_uid = decoded.get("uid")
-    except Exception as e:
-        return jsonify({"error": f"Invalid or expired Firebase token: {str(e)}"}), 401
+    firebase_uid = g.firebase_uid
     
     try:
         # Get all users except the current user
         all_users = UserRepo.get_all_users(exclude_uid=firebase_uid)
-        return jsonify({"users": all_users}), 200
+        return negotiated_response({"users": all_users})
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@bp.route("/feed/", methods=["GET", "OPTIONS"])
+def get_people_feed():
+    """Get a ranked page of users sharing courses with the current user"""
+    firebase_uid = g.firebase_uid
+
+    try:
+        limit = int(request.args.get("limit", 20))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    if limit < 1 or limit > 100:
+        return jsonify({"error": "limit must be between 1 and 100"}), 400
+
+    cursor = request.args.get("cursor")
+
+    try:
+        feed = UserRepo.get_ranked_people_feed(firebase_uid, limit=limit, cursor=cursor)
+        if feed is None:
+            return jsonify({"error": "User profile not found"}), 404
+        return negotiated_response(feed)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except Exception as e:
+        return jsonify({"error": str(e)}), 500
+
+
+@bp.route("/search/", methods=["GET", "OPTIONS"])
+def search_users():
+    """Search users by username with trigram similarity ranking"""
+    firebase_uid = g.firebase_uid
+
+    query = request.args.get("q", "").strip()
+    if not query:
+        return jsonify({"error": "Missing search query"}), 400
+
+    try:
+        limit = int(request.args.get("limit", 20))
+    except ValueError:
+        return jsonify({"error": "limit must be an integer"}), 400
+    if limit < 1 or limit > 100:
+        return jsonify({"error": "limit must be between 1 and 100"}), 400
+
+    cursor = request.args.get("cursor")
+
+    try:
+        return jsonify(UserRepo.search_users(firebase_uid, query, limit=limit, cursor=cursor)), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
         return jsonify({"error": str(e)}), 500
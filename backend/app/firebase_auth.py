@@ -1,52 +1,164 @@
 """
-Provides and authentication decorator for Firebase token verification.
-Injects uid and email into Flask g context for protected routes
+Provides the app-level authentication stage for Firebase token verification.
+Injects uid and email into Flask g context for protected routes; views opt out with @public_route
+
+Tokens are verified offline against locally cached signing keys (see app/token_verifier.py)
+and verified tokens are cached (keyed by token hash, expiring at the token's exp claim)
+so repeat calls from the same session skip the signature verification.
 
 """
 
 import firebase_admin
 from firebase_admin import auth, credentials
-from flask import request, g
+from flask import request, g, jsonify
+import hashlib
+import logging
 import os
-from functools import wraps  
+import threading
+from app.token_verifier import FirebaseTokenVerifier
+from app.utils.lru_cache import ExpiringLRUCache
+
+logger = logging.getLogger(__name__)
 
 # Initialize Firebase Admin app once
 if not firebase_admin._apps:
     cred_path = os.getenv("FIREBASE_SERVICE_ACCOUNT_PATH")
     firebase_admin.initialize_app(credentials.Certificate(cred_path))
 
+# Verified-token cache shared by all routes in this process
+_token_cache = ExpiringLRUCache(maxsize=int(os.getenv("TOKEN_CACHE_SIZE", "4096")))
+
+# "offline" verifies signatures locally (app/token_verifier.py), "admin" defers to firebase_admin
+TOKEN_VERIFIER_MODE = os.getenv("FIREBASE_TOKEN_VERIFIER", "offline")
+
+_verifier = None
+_verifier_lock = threading.Lock()
+
+
+def get_token_verifier() -> FirebaseTokenVerifier:
+    """
+    Return the process-wide offline verifier, creating it on first use.
+    Created lazily so each gunicorn worker starts its own refresh thread after fork.
+
+    """
+    global _verifier
+    if _verifier is None:
+        with _verifier_lock:
+            if _verifier is None:
+                project_id = os.getenv("FIREBASE_PROJECT_ID") or firebase_admin.get_app().project_id
+                verifier = FirebaseTokenVerifier(
+                    project_id,
+                    claims_cache=_token_cache,
+                    forced_refresh_interval=float(os.getenv("TOKEN_KEY_REFRESH_COOLDOWN", "60")),
+                )
+                try:
+                    verifier.refresh_keys()
+                except Exception as e:
+                    logger.warning("Initial signing key fetch failed, retrying on demand: %s", e)
+                verifier.start()
+                _verifier = verifier
+    return _verifier
+
+
+def set_token_verifier(verifier: FirebaseTokenVerifier) -> None:
+    """
+    Install a verifier explicitly, e.g. one backed by a StaticKeySource in tests and benchmarks.
+
+    """
+    global _verifier
+    with _verifier_lock:
+        if _verifier is not None and _verifier is not verifier:
+            _verifier.stop()
+        _verifier = verifier
+
+
+def verify_firebase_token(token: str) -> dict:
+    """
+    Verify a Firebase ID token and return its decoded claims.
+    Raises InvalidTokenError (offline mode) or the firebase_admin error if the token is invalid or expired.
+
+    """
+    if TOKEN_VERIFIER_MODE == "offline":
+        # The offline verifier shares _token_cache for its decoded claims
+        return get_token_verifier().verify(token)
+
+    key = hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+    decoded = _token_cache.get(key)
+    if decoded is not None:
+        return decoded
+
+    decoded = auth.verify_id_token(token)
+
+    # Never serve a token past its own expiry
+    exp = decoded.get("exp")
+    if exp:
+        _token_cache.set(key, decoded, expires_at=float(exp))
+
+    return decoded
+
+
+def token_cache_stats() -> dict:
+    """
+    Hit/miss counters of the verified-token cache.
 
-def firebase_auth_required(f):
     """
-    Decorator that:
+    return _token_cache.stats()
+
+
+def _authenticate_request():
+    """
     1. Extracts Authorization: Bearer <token>
-    2. Verifies token with Firebase
+    2. Verifies token with Firebase (through the verified-token cache)
     3. Stores uid + email into g.*
+
+    Returns an error response, or None once the identity is on g.
     """
+    auth_header = request.headers.get("Authorization", "")
 
-    @wraps(f)
-    def wrapper(*args, **kwargs):
-        # !!! Let CORS preflight through with no auth
-        if request.method == "OPTIONS":
-            return ("", 204)
+    if not auth_header.startswith("Bearer "):
+        return jsonify({"error": "Missing or invalid Authorization header"}), 401
 
-        auth_header = request.headers.get("Authorization", "")
+    token = auth_header.split(" ", 1)[1]
 
-        if not auth_header.startswith("Bearer "):
-            return {"error": "Missing or invalid Authorization header"}, 401
+    try:
+        decoded = verify_firebase_token(token)
+    except Exception as e:
+        return jsonify({"error": f"Invalid or expired Firebase token: {str(e)}"}), 401
 
-        token = auth_header.split(" ", 1)[1]
+    # Inject into global request context
+    g.firebase_uid = decoded.get("uid")
+    g.firebase_email = decoded.get("email")
+    g.firebase_claims = decoded
 
-        try:
-            decoded = auth.verify_id_token(token)
-        except Exception as e:
-            print("Token verification error:", e)
-            return {"error": "Invalid or expired token"}, 401
+    return None
+
+
+def public_route(f):
+    """
+    Decorator that marks a view as reachable without a Firebase token.
+    Place it below @bp.route so the registered view carries the marker.
+    """
+    f.is_public = True
+    return f
+
+
+def init_auth(app):
+    """
+    Register the app-level authentication stage.
+    Every route is authenticated unless its view is marked with @public_route.
+    """
+
+    @app.before_request
+    def authenticate_request():
+        # Answer CORS preflight before any auth or view work
+        if request.method == "OPTIONS":
+            return "", 200
 
-        # Inject into global request context
-        g.firebase_uid = decoded.get("uid")
-        g.firebase_email = decoded.get("email")
+        view = app.view_functions.get(request.endpoint)
 
-        return f(*args, **kwargs)
+        # Unknown routes fall through to Flask's 404/405 handling
+        if view is None or getattr(view, "is_public", False):
+            return None
 
-    return wrapper
+        return _authenticate_request()
@@ -0,0 +1,20 @@
+from app import db
+
+
+class UserCompatibility(db.Model):
+    """
+    Precomputed People Feed pairs: one row per direction for every pair of users
+    sharing at least one course, so a user's feed is a range scan on (uid_a, score desc, uid_b).
+    Maintained incrementally by CompatibilityRepo on enrollment/grade changes.
+    """
+    __tablename__ = "user_compatibility"
+
+    uid_a = db.Column(db.String, db.ForeignKey("users.uid"), primary_key=True)
+    uid_b = db.Column(db.String, db.ForeignKey("users.uid"), primary_key=True)
+    shared_course_count = db.Column(db.Integer, nullable=False)
+    grade_match = db.Column(db.Boolean, nullable=False)
+    score = db.Column(db.Float, nullable=False)
+
+    __table_args__ = (
+        db.Index("ix_user_compatibility_uid_a_score_uid_b", uid_a, score.desc(), uid_b),
+    )
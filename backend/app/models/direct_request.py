@@ -17,5 +17,13 @@ class DirectRequest(db.Model):
     created_at = db.Column(db.DateTime, server_default=db.func.now())
     updated_at = db.Column(db.DateTime, server_default=db.func.now(), onupdate=db.func.now())
     
+    # Inbox pages filter on the owner (and optionally status) and keyset-paginate on (created_at, id)
+    __table_args__ = (
+        db.Index("ix_direct_requests_receiver_created", "receiver_uid", "created_at", "id"),
+        db.Index("ix_direct_requests_receiver_status_created", "receiver_uid", "status", "created_at", "id"),
+        db.Index("ix_direct_requests_sender_created", "sender_uid", "created_at", "id"),
+        db.Index("ix_direct_requests_sender_status_created", "sender_uid", "status", "created_at", "id"),
+    )
+
     # No unique constraint allows multiple requests between same users over time
     # Duplicate prevention for pending requests is handled in application logic
\ No newline at end of file
@@ -6,7 +6,9 @@ from app import db
 group_courses = db.Table('group_courses',
     db.Column('group_id', db.Integer, db.ForeignKey('groups.id'), primary_key=True),
     db.Column('course_id', db.String, db.ForeignKey('courses.course_id'), primary_key=True),
-    db.Column('created_at', db.DateTime, default=datetime.utcnow)
+    db.Column('created_at', db.DateTime, default=datetime.utcnow),
+    # The primary key covers lookups by group; feed candidates are looked up by course
+    db.Index('ix_group_courses_course_id', 'course_id', 'group_id')
 )
 
 class GroupRole(Enum):
@@ -28,6 +30,9 @@ class Group(db.Model):
     is_visible = db.Column(db.Boolean, default=True, nullable=False)  # Visible on group feed
     privacy = db.Column(db.Enum(GroupPrivacy), default=GroupPrivacy.PRIVATE, nullable=False)
     
+    # Denormalized number of group_members rows, maintained by GroupRepo
+    member_count = db.Column(db.Integer, default=0, server_default='0', nullable=False)
+    
     # Timestamps
     created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow, nullable=False)
@@ -49,7 +54,7 @@ class Group(db.Model):
             'privacy': self.privacy.value,
             'created_at': self.created_at.isoformat(),
             'updated_at': self.updated_at.isoformat(),
-            'member_count': len(self.members),
+            'member_count': self.member_count,
             'courses': [{'course_id': course.course_id, 'title': course.title} for course in self.courses]
         }
 
@@ -71,6 +76,8 @@ class GroupMember(db.Model):
     # Constraints
     __table_args__ = (
         db.UniqueConstraint('group_id', 'user_uid', name='unique_group_member'),
+        # The unique constraint covers lookups by group; "my groups" and co-member queries go by user
+        db.Index('ix_group_members_user_uid', 'user_uid', 'group_id'),
     )
     
     def __repr__(self):
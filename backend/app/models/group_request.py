@@ -20,6 +20,9 @@ class GroupRequest(db.Model):
     # Prevent duplicate pending requests from same user to same group
     __table_args__ = (
         db.UniqueConstraint('requester_uid', 'group_id', 'status', name='unique_pending_group_request'),
+        # Pending lists per group (admin view) and per requester, newest first
+        db.Index('ix_group_requests_group_status_created', 'group_id', 'status', 'created_at'),
+        db.Index('ix_group_requests_requester_status_created', 'requester_uid', 'status', 'created_at'),
     )
     
     def to_dict(self):
@@ -43,3 +43,8 @@ class UserCourse(db.Model):
     __tablename__ = "user_courses"
     uid = db.Column(db.String, db.ForeignKey("users.uid"), primary_key=True)
     course_id = db.Column(db.String, db.ForeignKey("courses.course_id"), primary_key=True)
+
+    # The primary key covers lookups by user; classmates of a course are looked up by course
+    __table_args__ = (
+        db.Index("ix_user_courses_course_id", "course_id", "uid"),
+    )
@@ -0,0 +1,243 @@
+"""
+Compatibility Repository
+Maintains the precomputed user_compatibility table behind the People Feed
+
+Methods:
+- apply_enrollment_change(uid, grade, added, removed, grade_changed) - Incrementally update one user's pairs
+- get_ranked_peers(uid, limit, after)                                - Keyset page of a user's peers by score
+- count_peers(uid)                                                   - Number of peers sharing a course with user
+- rebuild()                                                          - Rebuild the whole table from enrollments
+"""
+
+from collections import Counter
+from sqlalchemy import and_, or_, case, func, insert, select, text
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import aliased
+from app import db
+from app.models.compatibility import UserCompatibility
+from app.models.user import User, UserProfile, UserCourse
+from app.utils.people_ranking import SHARED_COURSE_WEIGHT, GRADE_MATCH_WEIGHT, calculate_score
+
+
+def _upsert_insert():
+    """
+    The dialect's INSERT construct supporting ON CONFLICT DO UPDATE (PostgreSQL, or SQLite locally).
+
+    """
+    if db.session.get_bind().dialect.name == "sqlite":
+        return sqlite.insert
+    return postgresql.insert
+
+
+class CompatibilityRepo:
+    @staticmethod
+    def apply_enrollment_change(uid, grade, added=(), removed=(), grade_changed=False):
+        """
+        Update only the rows of peers enrolled in the added/removed courses, plus the
+        grade match of the user's rows if their grade changed.
+        Runs inside the caller's transaction; the caller commits.
+
+        Concurrent enrollments in the same course are serialized with a transaction-scoped
+        advisory lock per course (PostgreSQL), so the later transaction sees the earlier
+        one's committed enrollment and creates their pair. Counts are adjusted in SQL with
+        an upsert, so overlapping deltas for the same pair add up instead of colliding.
+
+        """
+        CompatibilityRepo._lock_courses(set(added) | set(removed))
+
+        deltas = Counter()
+        for course_ids, sign in ((added, 1), (removed, -1)):
+            if not course_ids:
+                continue
+            rows = (
+                db.session.query(UserCourse.uid, func.count(UserCourse.course_id))
+                .filter(UserCourse.course_id.in_(list(course_ids)), UserCourse.uid != uid)
+                .group_by(UserCourse.uid)
+                .all()
+            )
+            for peer_uid, count in rows:
+                deltas[peer_uid] += sign * count
+
+        deltas = {peer_uid: delta for peer_uid, delta in deltas.items() if delta}
+        if deltas:
+            CompatibilityRepo._apply_deltas(uid, grade, deltas)
+
+        if grade_changed:
+            CompatibilityRepo._refresh_grade_match(uid, grade)
+
+    @staticmethod
+    def _lock_courses(course_ids):
+        """
+        Take a transaction-scoped advisory lock per course, in a fixed order to avoid deadlocks.
+        Other databases serialize writers on their own (SQLite) and skip this.
+
+        """
+        if db.session.get_bind().dialect.name != "postgresql":
+            return
+        for course_id in sorted(course_ids):
+            db.session.execute(
+                text("SELECT pg_advisory_xact_lock(hashtext(:key))"), {"key": f"user_courses:{course_id}"}
+            )
+
+    @staticmethod
+    def _apply_deltas(uid, grade, deltas):
+        """
+        Adjust shared course counts in both directions with set-based statements: upsert pairs
+        gaining courses, decrement pairs losing courses and delete pairs reaching zero.
+
+        """
+        gained = {peer_uid: delta for peer_uid, delta in deltas.items() if delta > 0}
+        lost = {peer_uid: delta for peer_uid, delta in deltas.items() if delta < 0}
+
+        if gained:
+            peer_grades = dict(
+                db.session.query(UserProfile.uid, UserProfile.grade)
+                .filter(UserProfile.uid.in_(list(gained)))
+                .all()
+            )
+            rows = []
+            for peer_uid, delta in gained.items():
+                if peer_uid not in peer_grades:
+                    continue
+                grade_match = peer_grades[peer_uid] == grade
+                for uid_a, uid_b in ((uid, peer_uid), (peer_uid, uid)):
+                    rows.append({
+                        "uid_a": uid_a,
+                        "uid_b": uid_b,
+                        "shared_course_count": delta,
+                        "grade_match": grade_match,
+                        "score": calculate_score(delta, grade_match),
+                    })
+            if rows:
+                statement = _upsert_insert()(UserCompatibility).values(rows)
+                shared = UserCompatibility.shared_course_count + statement.excluded.shared_course_count
+                db.session.execute(statement.on_conflict_do_update(
+                    index_elements=[UserCompatibility.uid_a, UserCompatibility.uid_b],
+                    set_={
+                        "shared_course_count": shared,
+                        "score": shared * SHARED_COURSE_WEIGHT
+                        + case((UserCompatibility.grade_match, GRADE_MATCH_WEIGHT), else_=0.0),
+                    },
+                ))
+
+        if lost:
+            peers_by_delta = {}
+            for peer_uid, delta in lost.items():
+                peers_by_delta.setdefault(delta, []).append(peer_uid)
+
+            for delta, peers in peers_by_delta.items():
+                shared = UserCompatibility.shared_course_count + delta
+                UserCompatibility.query.filter(CompatibilityRepo._pairs_of(uid, peers)).update({
+                    UserCompatibility.shared_course_count: shared,
+                    UserCompatibility.score: shared * SHARED_COURSE_WEIGHT
+                    + case((UserCompatibility.grade_match, GRADE_MATCH_WEIGHT), else_=0.0),
+                }, synchronize_session=False)
+
+            UserCompatibility.query.filter(
+                CompatibilityRepo._pairs_of(uid, list(lost)),
+                UserCompatibility.shared_course_count <= 0,
+            ).delete(synchronize_session=False)
+
+    @staticmethod
+    def _pairs_of(uid, peers):
+        return or_(
+            and_(UserCompatibility.uid_a == uid, UserCompatibility.uid_b.in_(peers)),
+            and_(UserCompatibility.uid_b == uid, UserCompatibility.uid_a.in_(peers)),
+        )
+
+    @staticmethod
+    def _refresh_grade_match(uid, grade):
+        """
+        Recompute grade_match and score for every pair of the user with two set-based updates.
+
+        """
+        # Pending row changes must reach the database before the bulk updates run
+        db.session.flush()
+
+        same_grade = select(UserProfile.uid).where(UserProfile.grade == grade)
+        for own_column, peer_column in (
+            (UserCompatibility.uid_a, UserCompatibility.uid_b),
+            (UserCompatibility.uid_b, UserCompatibility.uid_a),
+        ):
+            is_match = peer_column.in_(same_grade)
+            UserCompatibility.query.filter(own_column == uid).update({
+                UserCompatibility.grade_match: case((is_match, True), else_=False),
+                UserCompatibility.score: (
+                    UserCompatibility.shared_course_count * SHARED_COURSE_WEIGHT
+                    + case((is_match, GRADE_MATCH_WEIGHT), else_=0.0)
+                ),
+            }, synchronize_session=False)
+
+    @staticmethod
+    def get_ranked_peers(uid, limit, after=None):
+        """
+        Return up to limit (peer_uid, score) rows ordered by score desc, then peer uid.
+        after is the (score, uid) of the last row of the previous page. The order matches
+        ix_user_compatibility_uid_a_score_uid_b, so a page is an index range scan.
+
+        """
+        query = UserCompatibility.query.with_entities(
+            UserCompatibility.uid_b, UserCompatibility.score
+        ).filter(UserCompatibility.uid_a == uid)
+
+        if after:
+            score, peer_uid = after
+            query = query.filter(or_(
+                UserCompatibility.score < score,
+                and_(UserCompatibility.score == score, UserCompatibility.uid_b > peer_uid),
+            ))
+
+        return (
+            query.order_by(UserCompatibility.score.desc(), UserCompatibility.uid_b)
+            .limit(limit)
+            .all()
+        )
+
+    @staticmethod
+    def count_peers(uid):
+        """
+        Count the users sharing at least one course with uid.
+
+        """
+        return UserCompatibility.query.filter(UserCompatibility.uid_a == uid).count()
+
+    @staticmethod
+    def rebuild():
+        """
+        Rebuild the whole table from user_courses + user_profiles with one INSERT ... SELECT.
+        Returns the number of rows written.
+
+        """
+        course_a, course_b = aliased(UserCourse), aliased(UserCourse)
+        profile_a, profile_b = aliased(UserProfile), aliased(UserProfile)
+
+        shared = func.count()
+        grade_match = profile_a.grade == profile_b.grade
+        pairs = (
+            select(
+                course_a.uid,
+                course_b.uid,
+                shared,
+                grade_match,
+                shared * SHARED_COURSE_WEIGHT + case((grade_match, GRADE_MATCH_WEIGHT), else_=0.0),
+            )
+            .select_from(course_a)
+            .join(course_b, and_(course_a.course_id == course_b.course_id, course_a.uid != course_b.uid))
+            .join(profile_a, profile_a.uid == course_a.uid)
+            .join(profile_b, profile_b.uid == course_b.uid)
+            .group_by(course_a.uid, course_b.uid, profile_a.grade, profile_b.grade)
+        )
+
+        try:
+            UserCompatibility.query.delete()
+            db.session.execute(
+                insert(UserCompatibility).from_select(
+                    ["uid_a", "uid_b", "shared_course_count", "grade_match", "score"], pairs
+                )
+            )
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        return UserCompatibility.query.count()
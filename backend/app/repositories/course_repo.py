@@ -0,0 +1,68 @@
+"""
+Course Repository
+Serves the course catalog from an in-process snapshot (the catalog changes about once a term)
+
+Freshness is TTL-only: each worker reloads its snapshot COURSE_CATALOG_TTL seconds after
+loading it, so courses added or retitled by upsert_courses (e.g. via seed_courses.py) reach
+every worker within that window. No query runs on reads served from the snapshot.
+
+Methods:
+- get_catalog()           - (courses, etag) snapshot; reloaded after the TTL
+- upsert_courses(courses) - Insert or update (course_id, title) pairs
+"""
+
+import os
+import threading
+import time
+from app import db
+from app.models.user import Course
+from app.utils.http_cache import json_etag
+
+# How long a worker serves its snapshot before reloading it from the DB
+CATALOG_TTL = float(os.getenv("COURSE_CATALOG_TTL", "300"))
+
+_catalog_lock = threading.Lock()
+_catalog = None  # (courses, etag, loaded_at)
+
+
+class CourseRepo:
+    @staticmethod
+    def get_catalog():
+        """
+        Return (courses, etag) where courses is the list of {course_id, title} sorted by course_id.
+
+        """
+        global _catalog
+        snapshot = _catalog
+        if snapshot is not None and time.monotonic() - snapshot[2] < CATALOG_TTL:
+            return snapshot[0], snapshot[1]
+
+        with _catalog_lock:
+            snapshot = _catalog
+            if snapshot is None or time.monotonic() - snapshot[2] >= CATALOG_TTL:
+                courses = [
+                    {"course_id": course_id, "title": title}
+                    for course_id, title in
+                    db.session.query(Course.course_id, Course.title).order_by(Course.course_id).all()
+                ]
+                snapshot = (courses, json_etag(courses), time.monotonic())
+                _catalog = snapshot
+        return snapshot[0], snapshot[1]
+
+    @staticmethod
+    def upsert_courses(courses):
+        """
+        Insert or update (course_id, title) pairs in one transaction. Returns the number written.
+        Running workers pick the changes up when their snapshot expires (CATALOG_TTL).
+
+        """
+        try:
+            for course_id, title in courses:
+                # Safe merge inserts or updates existing
+                db.session.merge(Course(course_id=course_id, title=title))
+            db.session.commit()
+        except Exception:
+            db.session.rollback()
+            raise
+
+        return len(courses)
@@ -4,8 +4,10 @@ Handles direct study buddy request operations
 
 Methods:
 - create_request(sender_uid, receiver_uid, message)      - Create a new study buddy (direct) request
-- get_user_incoming_requests(uid, status)                - Get direct requests received by user
-- get_user_outgoing_requests(uid, status)                - Get direct requests sent by user
+- get_incoming_page(uid, status, limit, cursor, counterpart_uids) - Page of requests received by user, with sender usernames
+- get_outgoing_page(uid, status, limit, cursor, counterpart_uids) - Page of requests sent by user, with receiver usernames
+- get_incoming_version(uid, status, counterpart_uids)    - Cheap version stamp of the incoming list (for ETags)
+- get_outgoing_version(uid, status, counterpart_uids)    - Cheap version stamp of the outgoing list (for ETags)
 - update_request_status(request_id, new_status, user_uid) - Accept or reject a direct request
 - cancel_request(request_id, sender_uid)                 - Cancel a sent direct request
 - get_request_by_id(request_id)                          - Fetch a specific direct request
@@ -14,8 +16,10 @@ Methods:
 
 from app import db
 from app.models.direct_request import DirectRequest, RequestStatus
+from app.models.user import User
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, func, tuple_
+from app.utils import request_cursor
 
 
 class DirectRequestRepo:
@@ -54,30 +58,108 @@ class DirectRequestRepo:
             raise e
 
     @staticmethod
-    def get_user_incoming_requests(uid, status=None):
+    def get_incoming_page(uid, status=None, limit=50, cursor=None, counterpart_uids=None):
         """
-        Get all incoming requests for a user.
+        Page of a user's incoming requests, newest first, each with the sender's username.
+        counterpart_uids optionally restricts it to requests from those senders.
+        Returns {"requests": [...], "next_cursor": str | None}; raises ValueError on a bad cursor.
 
         """
-        query = DirectRequest.query.filter_by(receiver_uid=uid)
-        
+        return DirectRequestRepo._page(
+            DirectRequest.receiver_uid, DirectRequest.sender_uid, "sender", uid, status, limit, cursor, counterpart_uids
+        )
+
+    @staticmethod
+    def get_outgoing_page(uid, status=None, limit=50, cursor=None, counterpart_uids=None):
+        """
+        Page of a user's outgoing requests, newest first, each with the receiver's username.
+        counterpart_uids optionally restricts it to requests to those receivers.
+
+        """
+        return DirectRequestRepo._page(
+            DirectRequest.sender_uid, DirectRequest.receiver_uid, "receiver", uid, status, limit, cursor, counterpart_uids
+        )
+
+    @staticmethod
+    def _page(owner_column, other_column, other_role, uid, status, limit, cursor, counterpart_uids=None):
+        # One query: the owner's requests joined to the other party's username,
+        # keyset-paginated on (created_at, id) so it stays on the composite index
+        query = (
+            db.session.query(DirectRequest, User.username)
+            .outerjoin(User, User.uid == other_column)
+            .filter(owner_column == uid)
+        )
         if status:
-            query = query.filter_by(status=status)
-        
-        return query.order_by(DirectRequest.created_at.desc()).all()
+            query = query.filter(DirectRequest.status == status)
+        if counterpart_uids is not None:
+            query = query.filter(other_column.in_(counterpart_uids))
+        if cursor:
+            created_at, request_id = request_cursor.decode_cursor(cursor)
+            query = query.filter(tuple_(DirectRequest.created_at, DirectRequest.id) < tuple_(created_at, request_id))
+
+        rows = (
+            query.order_by(DirectRequest.created_at.desc(), DirectRequest.id.desc())
+            .limit(limit + 1)
+            .all()
+        )
+
+        page = rows[:limit]
+        requests = [
+            {
+                "id": req.id,
+                f"{other_role}_uid": getattr(req, f"{other_role}_uid"),
+                f"{other_role}_username": username or "Unknown",
+                "message": req.message,
+                "status": req.status.value,
+                "created_at": req.created_at.isoformat(),
+                "updated_at": req.updated_at.isoformat(),
+            }
+            for req, username in page
+        ]
+        next_cursor = None
+        if len(rows) > limit:
+            last = page[-1][0]
+            next_cursor = request_cursor.encode_cursor(last.created_at, last.id)
+        return {"requests": requests, "next_cursor": next_cursor}
 
     @staticmethod
-    def get_user_outgoing_requests(uid, status=None):
+    def get_incoming_version(uid, status=None, counterpart_uids=None):
         """
-        Get all outgoing requests for a user.
-        
+        Version stamp of a user's incoming list: changes whenever a request is added, removed
+        or updated, or the sender's username changes.
+
         """
-        query = DirectRequest.query.filter_by(sender_uid=uid)
-        
+        return DirectRequestRepo._list_version(
+            DirectRequest.receiver_uid, DirectRequest.sender_uid, uid, status, counterpart_uids
+        )
+
+    @staticmethod
+    def get_outgoing_version(uid, status=None, counterpart_uids=None):
+        """
+        Version stamp of a user's outgoing list (see get_incoming_version).
+
+        """
+        return DirectRequestRepo._list_version(
+            DirectRequest.sender_uid, DirectRequest.receiver_uid, uid, status, counterpart_uids
+        )
+
+    @staticmethod
+    def _list_version(owner_column, other_column, uid, status, counterpart_uids=None):
+        query = (
+            db.session.query(
+                func.count(DirectRequest.id),
+                func.max(DirectRequest.id),
+                func.max(DirectRequest.updated_at),
+                func.max(User.updated_at),
+            )
+            .outerjoin(User, User.uid == other_column)
+            .filter(owner_column == uid)
+        )
         if status:
-            query = query.filter_by(status=status)
-        
-        return query.order_by(DirectRequest.created_at.desc()).all()
+            query = query.filter(DirectRequest.status == status)
+        if counterpart_uids is not None:
+            query = query.filter(other_column.in_(counterpart_uids))
+        return tuple(query.one())
 
     @staticmethod
     def update_request_status(request_id, new_status, user_uid=None):
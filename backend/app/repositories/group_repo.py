@@ -5,26 +5,40 @@ Handles study group operations, membership management, and course associations
 Methods:
 - create_group(name, admin_uid, description, is_visible, privacy, course_ids) - Create a new study group
 - get_group(group_id)                                   - Get group details by ID
+- get_group_details_for_member(group_id, user_uid)      - Group, courses and members with usernames, if user is a member
 - get_user_groups(user_uid)                             - Get all groups a user belongs to
+- get_user_groups_version(user_uid)                     - Cheap version stamp of get_user_groups (for ETags)
 - get_visible_groups()                                  - Get all publicly visible groups
 - add_member(group_id, user_uid, role)                  - Add a member to a group
 - remove_member(group_id, user_uid)                     - Remove a member from a group
 - kick_member(group_id, admin_uid, member_to_kick_uid)  - Admin kicks a member from group
 - update_group_info(group_id, name, description, is_visible) - Update group details
 - update_member_role(group_id, user_uid, new_role)      - Change member's role
+- get_member_role(group_id, user_uid)                   - Caller's role in a group (memoized per request)
 - is_member(group_id, user_uid)                         - Check if user is a member
 - is_admin(group_id, user_uid)                          - Check if user is an admin
 - get_group_members(group_id)                           - Get all members of a group
+- get_shared_membership_uids(user_uid, among)           - Users sharing at least one group with user_uid
 - add_course_to_group(group_id, course_id)              - Add a course to group's study list
 - remove_course_from_group(group_id, course_id)         - Remove a course from group
 - get_groups_by_course(course_id)                       - Get all groups studying a course for Group Feed
-- get_recommended_groups_for_user(user_uid)             - Get personalized group recommendations for Group Feed
+- get_recommended_groups_for_user(user_uid, limit, cursor) - Ranked, paginated group recommendations for Group Feed
+- reconcile_member_counts()                             - Repair denormalized member_count columns
 """
 
+import logging
+from datetime import datetime
 from typing import List, Optional, Dict, Any
+from flask import g, has_app_context, has_request_context
+from sqlalchemy import and_, case, func, or_, select
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import aliased, selectinload
 from app import db
-from app.models.group import Group, GroupMember, GroupRole, GroupPrivacy
+from app.models.group import Group, GroupMember, GroupRole, GroupPrivacy, group_courses
+from app.utils import group_ranking
+from app.utils.co_member_graph import co_member_graph
+
+logger = logging.getLogger(__name__)
 
 class GroupRepo:
     
@@ -42,7 +56,8 @@ class GroupRepo:
                 name=name,
                 description=description,
                 is_visible=is_visible,
-                privacy=privacy
+                privacy=privacy,
+                member_count=1  # the admin
             )
             
             db.session.add(group)
@@ -65,22 +80,26 @@ class GroupRepo:
                     if course:
                         group.courses.append(course)
                     else:
-                        print(f"Warning: Course {course_id} not found, skipping...")
+                        logger.warning("Course %s not found, skipping", course_id, extra={"course_id": course_id})
             
             db.session.commit()
             
             # Refresh to get all relationships
             db.session.refresh(group)
             
+            if co_member_graph:
+                co_member_graph.add_member(group.id, admin_uid)
+            GroupRepo._invalidate_role(group.id, admin_uid)
+            
             return group.to_dict()
             
         except IntegrityError as e:
             db.session.rollback()
-            print(f"Error creating group: {e}")
+            logger.error("Error creating group: %s", e)
             return None
         except Exception as e:
             db.session.rollback()
-            print(f"Unexpected error creating group: {e}")
+            logger.exception("Unexpected error creating group: %s", e)
             return None
     
     @staticmethod
@@ -100,8 +119,46 @@ class GroupRepo:
             
             return group_data
         except Exception as e:
-            print(f"Error getting group {group_id}: {e}")
+            logger.error("Error getting group: %s", e, extra={"group_id": group_id})
+            return None
+    
+    @staticmethod
+    def get_group_details_for_member(group_id: int, user_uid: str) -> Optional[Dict[str, Any]]:
+        """
+        Get group details with courses and members (with usernames) for the group detail page.
+        Returns None if the user is not a member (or the group does not exist).
+        One joined query for group + members + usernames, one selectin query for courses.
+
+        """
+        from app.models.user import User
+        
+        rows = (
+            db.session.query(Group, GroupMember, User.username)
+            .join(GroupMember, GroupMember.group_id == Group.id)
+            .outerjoin(User, User.uid == GroupMember.user_uid)
+            .filter(Group.id == group_id)
+            .options(selectinload(Group.courses))
+            .order_by(GroupMember.joined_at)
+            .all()
+        )
+        
+        user_member = next((member for _, member, _ in rows if member.user_uid == user_uid), None)
+        if not user_member:
             return None
+        
+        group_data = rows[0][0].to_dict()
+        group_data['members'] = [
+            {
+                "user_uid": member.user_uid,
+                "username": username or "Unknown",
+                "role": member.role.value,
+                "joined_at": member.joined_at.isoformat()
+            }
+            for _, member, username in rows
+        ]
+        group_data['user_role'] = user_member.role.value
+        
+        return group_data
     
     @staticmethod
     def get_user_groups(user_uid: str) -> List[Dict[str, Any]]:
@@ -110,20 +167,47 @@ class GroupRepo:
 
         """
         try:
-            member_records = GroupMember.query.filter_by(user_uid=user_uid).all()
+            # One joined query for memberships + groups, one selectin query for all their courses
+            member_records = (
+                db.session.query(GroupMember, Group)
+                .join(Group, Group.id == GroupMember.group_id)
+                .filter(GroupMember.user_uid == user_uid)
+                .options(selectinload(Group.courses))
+                .all()
+            )
             groups = []
             
-            for member in member_records:
-                group_data = member.group.to_dict()
+            for member, group in member_records:
+                group_data = group.to_dict()
                 group_data['user_role'] = member.role.value
                 group_data['joined_at'] = member.joined_at.isoformat()
                 groups.append(group_data)
             
             return groups
         except Exception as e:
-            print(f"Error getting user groups for {user_uid}: {e}")
+            logger.error("Error getting user groups: %s", e, extra={"member_uid": user_uid})
             return []
     
+    @staticmethod
+    def get_user_groups_version(user_uid: str) -> tuple:
+        """
+        Version stamp of get_user_groups: changes when the user joins/leaves a group, their
+        role changes, or any of their groups is updated (info, visibility, courses, member count).
+
+        """
+        return tuple(
+            db.session.query(
+                func.count(GroupMember.id),
+                func.max(GroupMember.id),
+                func.sum(case((GroupMember.role == GroupRole.ADMIN, 1), else_=0)),
+                func.max(Group.updated_at),
+                func.sum(Group.member_count),
+            )
+            .join(Group, Group.id == GroupMember.group_id)
+            .filter(GroupMember.user_uid == user_uid)
+            .one()
+        )
+    
     @staticmethod
     def get_visible_groups() -> List[Dict[str, Any]]:
         """
@@ -133,7 +217,7 @@ class GroupRepo:
             groups = Group.query.filter_by(is_visible=True).order_by(Group.created_at.desc()).all()
             return [group.to_dict() for group in groups]
         except Exception as e:
-            print(f"Error getting visible groups: {e}")
+            logger.error("Error getting visible groups: %s", e)
             return []
     
     @staticmethod
@@ -146,7 +230,7 @@ class GroupRepo:
             # Check if group exists
             group = Group.query.get(group_id)
             if not group:
-                print(f"Group {group_id} not found")
+                logger.debug("Group not found", extra={"group_id": group_id})
                 return False
             
             # Check if user is already a member
@@ -156,7 +240,7 @@ class GroupRepo:
             ).first()
             
             if existing_member:
-                print(f"User {user_uid} is already a member of group {group_id}")
+                logger.debug("User is already a member", extra={"group_id": group_id, "member_uid": user_uid})
                 return False
             
             # Add new member
@@ -167,17 +251,22 @@ class GroupRepo:
             )
             
             db.session.add(new_member)
+            GroupRepo._adjust_member_count(group_id, 1)
             db.session.commit()
             
+            if co_member_graph:
+                co_member_graph.add_member(group_id, user_uid)
+            GroupRepo._invalidate_role(group_id, user_uid)
+            
             return True
             
         except IntegrityError as e:
             db.session.rollback()
-            print(f"Error adding member to group: {e}")
+            logger.error("Error adding member to group: %s", e, extra={"group_id": group_id, "member_uid": user_uid})
             return False
         except Exception as e:
             db.session.rollback()
-            print(f"Unexpected error adding member: {e}")
+            logger.exception("Unexpected error adding member: %s", e, extra={"group_id": group_id, "member_uid": user_uid})
             return False
     
     @staticmethod
@@ -194,7 +283,7 @@ class GroupRepo:
             ).first()
             
             if not member_to_remove:
-                print(f"User {user_uid} is not a member of group {group_id}")
+                logger.debug("User is not a member", extra={"group_id": group_id, "member_uid": user_uid})
                 return False
             
             # Get all members of the group
@@ -215,17 +304,23 @@ class GroupRepo:
                 
                 if new_admin:
                     new_admin.role = GroupRole.ADMIN
-                    print(f"Transferred admin role to user {new_admin.user_uid}")
+                    GroupRepo._invalidate_role(group_id, new_admin.user_uid)
+                    logger.info("Transferred admin role", extra={"group_id": group_id, "member_uid": new_admin.user_uid})
             
             # Remove the member
             db.session.delete(member_to_remove)
+            GroupRepo._adjust_member_count(group_id, -1)
             db.session.commit()
             
+            if co_member_graph:
+                co_member_graph.remove_member(group_id, user_uid)
+            GroupRepo._invalidate_role(group_id, user_uid)
+            
             return True
             
         except Exception as e:
             db.session.rollback()
-            print(f"Error removing member from group: {e}")
+            logger.error("Error removing member from group: %s", e, extra={"group_id": group_id, "member_uid": user_uid})
             return False
     
     @staticmethod
@@ -236,13 +331,7 @@ class GroupRepo:
         """
         try:
             # Verify admin role
-            admin_member = GroupMember.query.filter_by(
-                group_id=group_id,
-                user_uid=admin_uid,
-                role=GroupRole.ADMIN
-            ).first()
-            
-            if not admin_member:
+            if not GroupRepo.is_admin(group_id, admin_uid):
                 return {
                     "success": False,
                     "error": "You must be an admin to kick members"
@@ -282,7 +371,7 @@ class GroupRepo:
                 }
                 
         except Exception as e:
-            print(f"Error kicking member: {e}")
+            logger.error("Error kicking member: %s", e, extra={"group_id": group_id})
             return {
                 "success": False,
                 "error": f"Database error: {str(e)}"
@@ -321,7 +410,7 @@ class GroupRepo:
                 group.privacy = privacy
             
             db.session.commit()
-            print(f"Group {group_id} updated successfully")
+            logger.info("Group updated", extra={"group_id": group_id})
             
             return {
                 "success": True,
@@ -330,7 +419,7 @@ class GroupRepo:
             
         except Exception as e:
             db.session.rollback()
-            print(f"Error updating group {group_id}: {e}")
+            logger.error("Error updating group: %s", e, extra={"group_id": group_id})
             return {
                 "success": False,
                 "error": f"Database error: {str(e)}"
@@ -343,7 +432,7 @@ class GroupRepo:
             
         except Exception as e:
             db.session.rollback()
-            print(f"Error updating group {group_id}: {e}")
+            logger.exception("Error updating group: %s", e, extra={"group_id": group_id})
             return False
     
     @staticmethod
@@ -359,19 +448,48 @@ class GroupRepo:
             ).first()
             
             if not member:
-                print(f"Member {user_uid} not found in group {group_id}")
+                logger.debug("Member not found", extra={"group_id": group_id, "member_uid": user_uid})
                 return False
             
             member.role = new_role
             db.session.commit()
+            GroupRepo._invalidate_role(group_id, user_uid)
             
             return True
             
         except Exception as e:
             db.session.rollback()
-            print(f"Error updating member role: {e}")
+            logger.error("Error updating member role: %s", e, extra={"group_id": group_id, "member_uid": user_uid})
             return False
     
+    @staticmethod
+    def get_member_role(group_id: int, user_uid: str) -> Optional[GroupRole]:
+        """
+        Get a user's role in a group, or None if they are not a member.
+        Read from group_members once per request and memoized on flask.g, so repeated
+        admin/member checks in one request share a single point query. Nothing is kept
+        across requests: authorization always sees the committed membership.
+
+        """
+        key = (group_id, user_uid)
+        request_roles = g.setdefault("group_roles", {}) if has_request_context() else {}
+        if key in request_roles:
+            return request_roles[key]
+        
+        row = (
+            db.session.query(GroupMember.role)
+            .filter_by(group_id=group_id, user_uid=user_uid)
+            .first()
+        )
+        role = row[0] if row else None
+        request_roles[key] = role
+        return role
+    
+    @staticmethod
+    def _invalidate_role(group_id: int, user_uid: str) -> None:
+        if has_app_context():
+            g.setdefault("group_roles", {}).pop((group_id, user_uid), None)
+    
     @staticmethod
     def is_member(group_id: int, user_uid: str) -> bool:
         """
@@ -379,13 +497,9 @@ class GroupRepo:
 
         """
         try:
-            member = GroupMember.query.filter_by(
-                group_id=group_id, 
-                user_uid=user_uid
-            ).first()
-            return member is not None
+            return GroupRepo.get_member_role(group_id, user_uid) is not None
         except Exception as e:
-            print(f"Error checking membership: {e}")
+            logger.error("Error checking membership: %s", e, extra={"group_id": group_id})
             return False
     
     @staticmethod
@@ -395,14 +509,9 @@ class GroupRepo:
 
         """
         try:
-            member = GroupMember.query.filter_by(
-                group_id=group_id, 
-                user_uid=user_uid,
-                role=GroupRole.ADMIN
-            ).first()
-            return member is not None
+            return GroupRepo.get_member_role(group_id, user_uid) == GroupRole.ADMIN
         except Exception as e:
-            print(f"Error checking admin status: {e}")
+            logger.error("Error checking admin status: %s", e, extra={"group_id": group_id})
             return False
     
     @staticmethod
@@ -415,14 +524,73 @@ class GroupRepo:
             members = GroupMember.query.filter_by(group_id=group_id).order_by(GroupMember.joined_at).all()
             return [member.to_dict() for member in members]
         except Exception as e:
-            print(f"Error getting group members: {e}")
+            logger.error("Error getting group members: %s", e, extra={"group_id": group_id})
             return []
     
+    @staticmethod
+    def get_shared_membership_uids(user_uid: str, among: List[str] = None) -> set:
+        """
+        Get the uids of users sharing at least one group with user_uid, optionally
+        restricted to the uids in among. Uses the co-member graph when enabled,
+        otherwise one self-join on group_members.
+
+        """
+        if co_member_graph:
+            if co_member_graph.needs_reload():
+                co_member_graph.load(db.session.query(GroupMember.group_id, GroupMember.user_uid).all())
+            shared = co_member_graph.co_members(user_uid)
+            return shared if among is None else shared.intersection(among)
+        
+        other = aliased(GroupMember)
+        query = (
+            db.session.query(other.user_uid)
+            .join(GroupMember, GroupMember.group_id == other.group_id)
+            .filter(GroupMember.user_uid == user_uid, other.user_uid != user_uid)
+        )
+        if among is not None:
+            query = query.filter(other.user_uid.in_(list(among)))
+        
+        return {uid for (uid,) in query.distinct().all()}
+    
+    @staticmethod
+    def _adjust_member_count(group_id: int, delta: int) -> None:
+        """
+        Atomically add delta to a group's member_count in the current transaction.
+
+        """
+        Group.query.filter_by(id=group_id).update(
+            {Group.member_count: Group.member_count + delta},
+            synchronize_session=False
+        )
+    
+    @staticmethod
+    def reconcile_member_counts() -> int:
+        """
+        Reset member_count to the actual number of members wherever it drifted.
+        Returns the number of groups corrected.
+
+        """
+        try:
+            actual = (
+                select(func.count(GroupMember.id))
+                .where(GroupMember.group_id == Group.id)
+                .scalar_subquery()
+            )
+            corrected = Group.query.filter(Group.member_count != actual).update(
+                {Group.member_count: actual},
+                synchronize_session=False
+            )
+            db.session.commit()
+            return corrected
+        except Exception:
+            db.session.rollback()
+            raise
+    
     @staticmethod
     def _delete_group(group_id: int) -> bool:
         """
         Delete a group and all its members.
-        Private method used when last member leaves.
+        Private method used when last member leaves. The member_count goes with the group row.
 
         """
         try:
@@ -430,19 +598,28 @@ class GroupRepo:
             if not group:
                 return False
             
+            member_uids = [
+                uid for (uid,) in
+                db.session.query(GroupMember.user_uid).filter_by(group_id=group_id).all()
+            ]
+            
             # Delete all members first 
             GroupMember.query.filter_by(group_id=group_id).delete()
             
             # Delete the group
             db.session.delete(group)
             db.session.commit()
+            if co_member_graph:
+                co_member_graph.remove_group(group_id)
+            for uid in member_uids:
+                GroupRepo._invalidate_role(group_id, uid)
             
-            print(f"Group {group_id} deleted (last member left)")
+            logger.info("Group deleted (last member left)", extra={"group_id": group_id})
             return True
             
         except Exception as e:
             db.session.rollback()
-            print(f"Error deleting group {group_id}: {e}")
+            logger.error("Error deleting group: %s", e, extra={"group_id": group_id})
             return False
     
     @staticmethod
@@ -458,23 +635,24 @@ class GroupRepo:
             course = Course.query.get(course_id)
             
             if not group or not course:
-                print(f"Group {group_id} or course {course_id} not found")
+                logger.debug("Group or course not found", extra={"group_id": group_id, "course_id": course_id})
                 return False
             
             # Check if course is already in group
             if course in group.courses:
-                print(f"Course {course_id} already in group {group_id}")
+                logger.debug("Course already in group", extra={"group_id": group_id, "course_id": course_id})
                 return True  
             
             group.courses.append(course)
+            group.updated_at = datetime.utcnow()  # association writes don't touch the group row
             db.session.commit()
             
-            print(f"Added course {course_id} to group {group_id}")
+            logger.info("Added course to group", extra={"group_id": group_id, "course_id": course_id})
             return True
             
         except Exception as e:
             db.session.rollback()
-            print(f"Error adding course to group: {e}")
+            logger.error("Error adding course to group: %s", e, extra={"group_id": group_id, "course_id": course_id})
             return False
     
     @staticmethod
@@ -490,21 +668,22 @@ class GroupRepo:
             course = Course.query.get(course_id)
             
             if not group or not course:
-                print(f"Group {group_id} or course {course_id} not found")
+                logger.debug("Group or course not found", extra={"group_id": group_id, "course_id": course_id})
                 return False
             
             if course in group.courses:
                 group.courses.remove(course)
+                group.updated_at = datetime.utcnow()  # association writes don't touch the group row
                 db.session.commit()
-                print(f"Removed course {course_id} from group {group_id}")
+                logger.info("Removed course from group", extra={"group_id": group_id, "course_id": course_id})
             else:
-                print(f"Course {course_id} not in group {group_id}")
+                logger.debug("Course not in group", extra={"group_id": group_id, "course_id": course_id})
             
             return True
             
         except Exception as e:
             db.session.rollback()
-            print(f"Error removing course from group: {e}")
+            logger.error("Error removing course from group: %s", e, extra={"group_id": group_id, "course_id": course_id})
             return False
     
     @staticmethod
@@ -514,95 +693,88 @@ class GroupRepo:
         
         """
         try:
-            from app.models.user import Course
-            
-            course = Course.query.get(course_id)
-            if not course:
-                return []
-            
             # Get all public groups for this course to build Group Feed
-            groups = Group.query.join(Group.courses).filter(
-                Course.course_id == course_id,
-                Group.is_visible == True
-            ).all()
+            groups = (
+                Group.query
+                .join(group_courses, group_courses.c.group_id == Group.id)
+                .filter(group_courses.c.course_id == course_id, Group.is_visible == True)
+                .options(selectinload(Group.courses))
+                .order_by(Group.id)
+                .all()
+            )
             
             return [group.to_dict() for group in groups]
             
         except Exception as e:
-            print(f"Error getting groups by course: {e}")
+            logger.error("Error getting groups by course: %s", e)
             return []
     
     @staticmethod
-    def get_recommended_groups_for_user(user_uid: str) -> List[Dict[str, Any]]:
+    def get_recommended_groups_for_user(user_uid: str, limit: int = 50, cursor: str = None) -> Dict[str, Any]:
         """
-        Get visible groups that study courses the user is enrolled in.
+        Get one ranked page of visible groups that study courses the user is enrolled in.
         Excludes groups the user is already a member of.
-        Returns groups with shared courses (unranked)
+        Overlap counting, the membership anti-join, visibility and ordering (overlap desc,
+        id desc) run in one statement against the DB. Raises ValueError for an invalid cursor.
     
         """
-        try:
-            from app.models.user import UserCourse, Course
-            from app.repositories.user_repo import UserRepo
-            
-            # Get user's courses
-            user_data = UserRepo.get_user(user_uid)
-            if not user_data:
-                print(f"Debug: User {user_uid} not found")
-                return []
-            
-            user_course_ids = user_data.get('courses', [])
-            print(f"Debug: User {user_uid} is enrolled in courses: {user_course_ids}")
-            
-            if not user_course_ids:
-                print(f"Debug: User {user_uid} has no course enrollments")
-                return []
-            
-            # Get user's current group memberships to exclude them
-            user_groups = GroupMember.query.filter_by(user_uid=user_uid).all()
-            user_group_ids = [ug.group_id for ug in user_groups]
-            
-            # Find visible groups that study any of the user's courses
-            query = Group.query.join(Group.courses).filter(
-                Course.course_id.in_(user_course_ids),
-                Group.is_visible == True
+        from app.models.user import UserCourse
+        
+        after = group_ranking.decode_cursor(cursor) if cursor else None
+        
+        user_course_ids = [
+            course_id for (course_id,) in
+            db.session.query(UserCourse.course_id).filter(UserCourse.uid == user_uid).all()
+        ]
+        if not user_course_ids:
+            return {"user_courses": [], "groups": [], "next_cursor": None}
+        
+        overlap_count = func.count(group_courses.c.course_id)
+        already_member = (
+            select(GroupMember.id)
+            .where(GroupMember.group_id == Group.id, GroupMember.user_uid == user_uid)
+            .exists()
+        )
+        
+        query = (
+            db.session.query(Group, overlap_count)
+            .join(group_courses, group_courses.c.group_id == Group.id)
+            .filter(
+                group_courses.c.course_id.in_(user_course_ids),
+                Group.is_visible == True,
+                ~already_member
             )
-            
-            # Exclude groups user is already in
-            if user_group_ids:
-                query = query.filter(~Group.id.in_(user_group_ids))
-            
-            groups = query.distinct().all()
-            
-            print(f"Debug: Found {len(groups)} visible groups for user courses: {user_course_ids}")
-            print(f"Debug: User is already in groups: {user_group_ids}")
-            for group in groups:
-                print(f"Debug: Group {group.id} ({group.name}) - visible: {group.is_visible}, privacy: {group.privacy}")
-            
-            # Add course overlap information and user courses for ranking
-            groups_with_overlap = []
-            for group in groups:
-                group_dict = group.to_dict()
-                
-                # Find which of the user's courses overlap with this group
-                group_course_ids = [course.course_id for course in group.courses]
-                overlapping_courses = [
-                    course_id for course_id in user_course_ids 
-                    if course_id in group_course_ids
-                ]
-                
-                group_dict['overlapping_courses'] = overlapping_courses
-                group_dict['overlap_count'] = len(overlapping_courses)
-                
-                groups_with_overlap.append(group_dict)
-            
-            result = {
-                "user_courses": user_course_ids,
-                "groups": groups_with_overlap
-            }
-            
-            print(f"Returning {len(groups_with_overlap)} groups with overlap info (unranked)")
-            return result
-            
-        except Exception as e:
-            print(f"Error getting recommended groups for user: {e}")
-            return {"user_courses": [], "groups": []}
\ No newline at end of file
+            .group_by(Group.id)
+            .options(selectinload(Group.courses))
+        )
+        
+        if after:
+            last_overlap, last_group_id = after
+            query = query.having(or_(
+                overlap_count < last_overlap,
+                and_(overlap_count == last_overlap, Group.id < last_group_id)
+            ))
+        
+        rows = query.order_by(overlap_count.desc(), Group.id.desc()).limit(limit + 1).all()
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        
+        groups = []
+        for group, count in rows:
+            group_dict = group.to_dict()
+            group_dict['overlapping_courses'] = group_ranking.get_overlapping_courses(
+                user_course_ids, [course.course_id for course in group.courses]
+            )
+            group_dict['overlap_count'] = count
+            groups.append(group_dict)
+        
+        next_cursor = None
+        if has_more and rows:
+            last_group, last_count = rows[-1]
+            next_cursor = group_ranking.encode_cursor(last_count, last_group.id)
+        
+        return {
+            "user_courses": user_course_ids,
+            "groups": groups,
+            "next_cursor": next_cursor
+        }
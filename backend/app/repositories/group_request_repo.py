@@ -10,12 +10,15 @@ Methods:
 - get_request_by_id(request_id)                           - Fetch a specific request by ID
 """
 
+import logging
 from typing import List, Optional, Dict, Any
 from sqlalchemy.exc import IntegrityError
 from app import db
 from app.models.group_request import GroupRequest, GroupRequestStatus
 from app.models.group import Group, GroupMember, GroupRole, GroupPrivacy
 
+logger = logging.getLogger(__name__)
+
 class GroupRequestRepo:
     
     @staticmethod
@@ -155,7 +158,7 @@ class GroupRequestRepo:
             return enriched_requests
             
         except Exception as e:
-            print(f"Error getting pending requests for group: {e}")
+            logger.error("Error getting pending requests for group: %s", e, extra={"group_id": group_id})
             return []
     
     @staticmethod
@@ -173,7 +176,7 @@ class GroupRequestRepo:
             return [request.to_dict() for request in requests]
             
         except Exception as e:
-            print(f"Error getting user pending requests: {e}")
+            logger.error("Error getting user pending requests: %s", e)
             return []
     
     @staticmethod
@@ -250,5 +253,5 @@ class GroupRequestRepo:
             return request.to_dict() if request else None
             
         except Exception as e:
-            print(f"Error getting request by ID: {e}")
+            logger.error("Error getting request by ID: %s", e, extra={"request_id": request_id})
             return None
\ No newline at end of file
@@ -3,15 +3,29 @@ User Repository
 Handles user account creation, profile management, and course enrollments
 
 Methods:
-- create_user_with_profile(uid, username, email, profile, courses) - Create or update user with profile and courses
+- create_user_with_profile(uid, username, email, profile, courses) - Create or update user with profile and courses (returns change set)
 - get_user(uid)                                      - Get user profile by Firebase UID
 - get_user_by_username(username)                     - Get user profile by username
-- is_username_taken(username, exclude_uid)           - Check if username is already taken
+- is_username_taken(username, exclude_uid)           - Check if username is already taken (in-memory index)
+- suggest_usernames(prefix, limit)                   - Username prefix autocomplete (in-memory index)
+- search_users(uid, query, limit, cursor)            - Fuzzy, ranked username search (trigram index)
 - get_all_users(exclude_uid)                         - Get all users for building People Feed
+- get_users_bulk(uids)                               - Get many users keyed by UID in two set-based queries
+- get_ranked_people_feed(uid, limit, cursor)         - Get a ranked, paginated page of the People Feed
+- update_profile_fields(uid, fields)                 - Partially update username/profile fields
+- add_course(uid, course_id)                         - Enroll user in a single course
+- remove_course(uid, course_id)                      - Drop a single course enrollment
 """
 
+from collections import defaultdict
+from flask import current_app
 from app import db
 from app.models.user import User, UserProfile, UserCourse, Course, Gender, Grade
+from app.repositories.compatibility_repo import CompatibilityRepo
+from app.repositories.group_repo import GroupRepo
+from app.utils import people_ranking
+from app.utils.username_index import username_index
+from sqlalchemy import insert
 from sqlalchemy.exc import IntegrityError
 
 
@@ -20,6 +34,9 @@ class UserRepo:
     def create_user_with_profile(uid, username, email, profile, courses):
         """
         Create or update a user + profile + course enrollements.
+        Only the enrollment delta is written, and the change set is returned so
+        downstream indexes can update incrementally:
+        {"created", "username_changed", "previous_username", "grade_changed", "courses_added", "courses_removed"}
         
         """
         try:
@@ -30,15 +47,19 @@ class UserRepo:
                 profile["gender"] = Gender(profile["gender"])
                 
             # Update or insert user
+            previous_username = None
             user = User.query.get(uid)
+            created = user is None
             if not user:
                 user = User(uid=uid, username=username, email=email)
                 db.session.add(user)
             else:
+                previous_username = user.username
                 user.username = username
                 user.email = email
 
             # Update or insert profile
+            previous_grade = None
             user_profile = UserProfile.query.get(uid)
             if not user_profile:
                 user_profile = UserProfile(
@@ -49,18 +70,129 @@ class UserRepo:
                 )
                 db.session.add(user_profile)
             else:
+                previous_grade = user_profile.grade
                 user_profile.date_of_birth = profile["date_of_birth"]
                 user_profile.grade = profile["grade"]
                 user_profile.gender = profile["gender"]
 
-            # Replace course enrollments
-            UserCourse.query.filter_by(uid=uid).delete()
-            # Prevent duplicate course enrollments
-            for course_id in set(courses):
-                db.session.add(UserCourse(uid=uid, course_id=course_id))
+            # User row must exist before enrollments reference it
+            db.session.flush()
+
+            # Apply only the enrollment delta (set() prevents duplicate course enrollments)
+            added, removed = UserRepo._apply_course_delta(uid, set(courses))
+            grade_changed = previous_grade is not None and previous_grade != profile["grade"]
+
+            # Keep the People Feed pairs in sync within the same transaction
+            CompatibilityRepo.apply_enrollment_change(
+                uid,
+                profile["grade"],
+                added=added,
+                removed=removed,
+                grade_changed=grade_changed,
+            )
 
             db.session.commit()
 
+            if created:
+                username_index.add(username, uid)
+            elif previous_username != username:
+                username_index.rename(previous_username, username, uid)
+
+            return {
+                "created": created,
+                "username_changed": previous_username is not None and previous_username != username,
+                "previous_username": previous_username,
+                "grade_changed": grade_changed,
+                "courses_added": sorted(added),
+                "courses_removed": sorted(removed),
+            }
+
+        except IntegrityError as e:
+            db.session.rollback()
+            raise e
+        except ValueError as e:
+            db.session.rollback()
+            raise ValueError(f"Invalid enum value: {e}")
+
+    @staticmethod
+    def _apply_course_delta(uid, new_courses):
+        """
+        Bring a user's enrollments to new_courses with one bulk DELETE and one bulk INSERT.
+        Returns (added, removed) course id sets; unchanged enrollments are not rewritten.
+
+        """
+        previous_courses = {
+            course_id for (course_id,) in
+            db.session.query(UserCourse.course_id).filter_by(uid=uid).all()
+        }
+        added = new_courses - previous_courses
+        removed = previous_courses - new_courses
+
+        if removed:
+            UserCourse.query.filter(
+                UserCourse.uid == uid,
+                UserCourse.course_id.in_(removed)
+            ).delete(synchronize_session=False)
+
+        if added:
+            db.session.execute(
+                insert(UserCourse),
+                [{"uid": uid, "course_id": course_id} for course_id in sorted(added)]
+            )
+
+        return added, removed
+
+    @staticmethod
+    def update_profile_fields(uid, fields):
+        """
+        Partially update a user. fields may contain username, date_of_birth (date), grade, gender.
+        Only rows whose values actually change are written.
+        Returns {field: new value} for the changed fields, or None if the user has no profile.
+
+        """
+        try:
+            result = (
+                db.session.query(User, UserProfile)
+                .join(UserProfile, User.uid == UserProfile.uid)
+                .filter(User.uid == uid)
+                .first()
+            )
+            if not result:
+                return None
+
+            user, user_profile = result
+            previous_username = user.username
+            changed = {}
+
+            if "username" in fields and fields["username"] != user.username:
+                user.username = fields["username"]
+                changed["username"] = user.username
+
+            if "date_of_birth" in fields and fields["date_of_birth"] != user_profile.date_of_birth:
+                user_profile.date_of_birth = fields["date_of_birth"]
+                changed["date_of_birth"] = user_profile.date_of_birth.isoformat()
+
+            if "gender" in fields:
+                gender = Gender(fields["gender"])
+                if gender != user_profile.gender:
+                    user_profile.gender = gender
+                    changed["gender"] = gender.value
+
+            if "grade" in fields:
+                grade = Grade(fields["grade"])
+                if grade != user_profile.grade:
+                    user_profile.grade = grade
+                    changed["grade"] = grade.value
+                    CompatibilityRepo.apply_enrollment_change(uid, grade, grade_changed=True)
+
+            if changed:
+                db.session.commit()
+
+            if "username" in changed:
+                username_index.rename(previous_username, changed["username"], uid)
+
+            return changed
+
         except IntegrityError as e:
             db.session.rollback()
             raise e
@@ -68,6 +200,56 @@ class UserRepo:
             db.session.rollback()
             raise ValueError(f"Invalid enum value: {e}")
 
+    @staticmethod
+    def add_course(uid, course_id):
+        """
+        Enroll a user in one course. Returns True if added, False if already enrolled.
+        Raises ValueError if the user or course does not exist.
+
+        """
+        grade = db.session.query(UserProfile.grade).filter(UserProfile.uid == uid).scalar()
+        if grade is None:
+            raise ValueError("User profile not found")
+        if not Course.query.get(course_id):
+            raise ValueError(f"Course {course_id} not found")
+
+        if UserCourse.query.get((uid, course_id)):
+            return False
+
+        try:
+            db.session.add(UserCourse(uid=uid, course_id=course_id))
+            CompatibilityRepo.apply_enrollment_change(uid, grade, added={course_id})
+            db.session.commit()
+            return True
+        except IntegrityError as e:
+            db.session.rollback()
+            raise e
+
+    @staticmethod
+    def remove_course(uid, course_id):
+        """
+        Drop one course enrollment. Returns True if removed, False if not enrolled.
+        Raises ValueError when it is the user's last course.
+
+        """
+        enrollment = UserCourse.query.get((uid, course_id))
+        if not enrollment:
+            return False
+
+        if UserCourse.query.filter_by(uid=uid).count() <= 1:
+            raise ValueError("At least one course required")
+
+        grade = db.session.query(UserProfile.grade).filter(UserProfile.uid == uid).scalar()
+
+        try:
+            db.session.delete(enrollment)
+            CompatibilityRepo.apply_enrollment_change(uid, grade, removed={course_id})
+            db.session.commit()
+            return True
+        except Exception as e:
+            db.session.rollback()
+            raise e
+
     @staticmethod
     def get_user(uid):
         """
@@ -87,15 +269,7 @@ class UserRepo:
         courses = [
             uc.course_id for uc in UserCourse.query.filter_by(uid=uid).all()
         ]
-        return {
-            "uid": user_obj.uid,
-            "username": user_obj.username,
-            "email": user_obj.email,
-            "date_of_birth": profile.date_of_birth.isoformat() if profile.date_of_birth else None,  
-            "grade": profile.grade.value, 
-            "gender": profile.gender.value,  
-            "courses": courses,
-        }
+        return UserRepo._serialize_user(user_obj, profile, courses)
 
     @staticmethod
     def get_user_by_username(username):
@@ -103,6 +277,11 @@ class UserRepo:
         Return user by username, or none if not found.
 
         """
+        uid = UserRepo._get_username_index().lookup(username)
+        if uid:
+            return UserRepo.get_user(uid)
+
+        # Index may lag writes from other workers
         user = User.query.filter_by(username=username).first()
         if not user:
             return None
@@ -112,12 +291,63 @@ class UserRepo:
     def is_username_taken(username, exclude_uid=None):
         """
         Check if username is already taken by another user.
+        Answered from the in-memory index; the unique constraint still rejects
+        any race with another worker at commit time.
 
         """
-        query = User.query.filter_by(username=username)
-        if exclude_uid:
-            query = query.filter(User.uid != exclude_uid)
-        return query.first() is not None
+        owner_uid = UserRepo._get_username_index().lookup(username)
+        return owner_uid is not None and owner_uid != exclude_uid
+
+    @staticmethod
+    def suggest_usernames(prefix, limit=10):
+        """
+        Return up to limit usernames starting with prefix (case-insensitive).
+
+        """
+        return UserRepo._get_username_index().prefix(prefix, limit)
+
+    @staticmethod
+    def search_users(uid, query, limit=20, cursor=None):
+        """
+        Return one page of users whose username fuzzily matches query, best match first.
+        Matching runs on the in-memory trigram index; only the page is hydrated.
+        Raises ValueError for an invalid cursor.
+
+        """
+        after = people_ranking.decode_cursor(cursor) if cursor else None
+        rows = UserRepo._get_username_index().search(query, limit + 1, after=after, exclude_uid=uid)
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        hydrated = UserRepo.get_users_bulk([match_uid for _, _, match_uid in rows])
+        users = []
+        for similarity, _, match_uid in rows:
+            user_data = hydrated.get(match_uid)
+            if not user_data:
+                continue
+            user_data["similarity"] = similarity
+            users.append(user_data)
+
+        next_cursor = None
+        if has_more and rows:
+            last_similarity, last_username, last_uid = rows[-1]
+            next_cursor = people_ranking.encode_cursor(last_similarity, last_username, last_uid)
+
+        return {"users": users, "next_cursor": next_cursor}
+
+    @staticmethod
+    def _get_username_index():
+        app = current_app._get_current_object()
+
+        def load_rows():
+            # Own app context (and session) so the reload can also run on a background thread
+            with app.app_context():
+                try:
+                    return db.session.query(User.username, User.uid).all()
+                finally:
+                    db.session.remove()
+
+        return username_index.ensure_fresh(load_rows)
 
     @staticmethod
     def get_all_users(exclude_uid=None):
@@ -130,25 +360,113 @@ class UserRepo:
             db.session.query(User, UserProfile)
             .join(UserProfile, User.uid == UserProfile.uid)
         )
+        course_query = db.session.query(UserCourse.uid, UserCourse.course_id)
         
         if exclude_uid:
             query = query.filter(User.uid != exclude_uid)
+            course_query = course_query.filter(UserCourse.uid != exclude_uid)
         
         results = query.all()
-        users = []
+        courses_by_uid = UserRepo._group_courses(course_query.all())
         
-        for user_obj, profile in results:
-            courses = [
-                uc.course_id for uc in UserCourse.query.filter_by(uid=user_obj.uid).all()
-            ]
-            users.append({
-                "uid": user_obj.uid,
-                "username": user_obj.username,
-                "email": user_obj.email,
-                "date_of_birth": profile.date_of_birth.isoformat() if profile.date_of_birth else None,
-                "grade": profile.grade.value,
-                "gender": profile.gender.value,
-                "courses": courses,
-            })
-        
-        return users
+        return [
+            UserRepo._serialize_user(user_obj, profile, courses_by_uid.get(user_obj.uid, []))
+            for user_obj, profile in results
+        ]
+
+    @staticmethod
+    def get_users_bulk(uids):
+        """
+        Return {uid: user dict} for the given UIDs.
+        Users + profiles come from one query and all their course enrollments from a second,
+        so the cost no longer grows with one round trip per user.
+
+        """
+        uids = list(set(uids or []))
+        if not uids:
+            return {}
+
+        results = (
+            db.session.query(User, UserProfile)
+            .join(UserProfile, User.uid == UserProfile.uid)
+            .filter(User.uid.in_(uids))
+            .all()
+        )
+        courses_by_uid = UserRepo._group_courses(
+            db.session.query(UserCourse.uid, UserCourse.course_id)
+            .filter(UserCourse.uid.in_(uids))
+            .all()
+        )
+
+        return {
+            user_obj.uid: UserRepo._serialize_user(user_obj, profile, courses_by_uid.get(user_obj.uid, []))
+            for user_obj, profile in results
+        }
+
+    @staticmethod
+    def get_ranked_people_feed(uid, limit=20, cursor=None):
+        """
+        Return one ranked page of the People Feed for a user, or None if the user has no profile.
+        Pages are keyset range scans over the precomputed user_compatibility rows of the user;
+        only the page is hydrated. total (peers sharing a course) is counted on the first page
+        only and is None on later pages. Raises ValueError for an invalid cursor.
+
+        """
+        current_user = UserRepo.get_user(uid)
+        if not current_user:
+            return None
+
+        after = people_ranking.decode_feed_cursor(cursor) if cursor else None
+        rows = CompatibilityRepo.get_ranked_peers(uid, limit + 1, after)
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        page_uids = [peer_uid for peer_uid, _ in rows]
+        hydrated = UserRepo.get_users_bulk(page_uids)
+        study_partners = GroupRepo.get_shared_membership_uids(uid, among=page_uids) if page_uids else set()
+        users = []
+        for peer_uid, score in rows:
+            user_data = hydrated.get(peer_uid)
+            if not user_data:
+                continue
+            user_data["compatibility_score"] = score
+            user_data["shares_group"] = peer_uid in study_partners
+            user_data["shared_courses"] = people_ranking.get_shared_courses(
+                current_user["courses"], user_data["courses"]
+            )
+            users.append(user_data)
+
+        next_cursor = None
+        if has_more and rows:
+            last_uid, last_score = rows[-1]
+            next_cursor = people_ranking.encode_feed_cursor(last_score, last_uid)
+
+        total = CompatibilityRepo.count_peers(uid) if cursor is None else None
+        return {"users": users, "next_cursor": next_cursor, "total": total}
+
+    @staticmethod
+    def _group_courses(rows):
+        """
+        Group (uid, course_id) rows into {uid: [course_id, ...]}.
+
+        """
+        courses_by_uid = defaultdict(list)
+        for uid, course_id in rows:
+            courses_by_uid[uid].append(course_id)
+        return courses_by_uid
+
+    @staticmethod
+    def _serialize_user(user_obj, profile, courses):
+        """
+        Shared dict shape for a user + profile + courses.
+
+        """
+        return {
+            "uid": user_obj.uid,
+            "username": user_obj.username,
+            "email": user_obj.email,
+            "date_of_birth": profile.date_of_birth.isoformat() if profile.date_of_birth else None,
+            "grade": profile.grade.value,
+            "gender": profile.gender.value,
+            "courses": courses,
+        }
@@ -0,0 +1,279 @@
+"""
+Offline Firebase ID token verifier.
+Verifies RS256 signatures locally against an in-memory signing key set that is
+refreshed in the background before it expires, so requests never wait on the
+Google certificate fetch once the worker is warm.
+
+Key sources are pluggable:
+- GoogleCertKeySource   - Firebase's published x509 certificates (production)
+- StaticKeySource       - fixed local key set (tests and benchmarks)
+"""
+
+import hashlib
+import re
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import jwt
+import requests
+from cryptography import x509
+from cryptography.hazmat.primitives import serialization
+
+from app.utils.lru_cache import ExpiringLRUCache
+
+GOOGLE_CERTS_URL = (
+    "https://www.googleapis.com/robot/v1/metadata/x509/securetoken@system.gserviceaccount.com"
+)
+
+
+class InvalidTokenError(Exception):
+    """Raised when an ID token fails signature or claim validation."""
+
+
+class KeySourceError(Exception):
+    """Raised when a key source cannot provide signing keys."""
+
+
+def load_public_key(pem: str):
+    """
+    Load a public key from a PEM encoded x509 certificate or public key.
+
+    """
+    data = pem.encode("utf-8") if isinstance(pem, str) else pem
+    if b"BEGIN CERTIFICATE" in data:
+        return x509.load_pem_x509_certificate(data).public_key()
+    return serialization.load_pem_public_key(data)
+
+
+class KeySource:
+    """
+    Interface for signing key providers.
+    fetch() returns (kid -> public key, expires_at as epoch seconds).
+    """
+
+    def fetch(self) -> Tuple[Dict[str, Any], float]:
+        raise NotImplementedError
+
+
+class GoogleCertKeySource(KeySource):
+    """
+    Fetches the certificates Firebase signs ID tokens with.
+    Expiry follows the Cache-Control max-age of the response.
+    """
+
+    def __init__(self, url: str = GOOGLE_CERTS_URL, timeout: float = 5.0, default_ttl: float = 3600):
+        self.url = url
+        self.timeout = timeout
+        self.default_ttl = default_ttl
+
+    def fetch(self) -> Tuple[Dict[str, Any], float]:
+        try:
+            response = requests.get(self.url, timeout=self.timeout)
+            response.raise_for_status()
+            certs = response.json()
+        except Exception as e:
+            raise KeySourceError(f"Failed to fetch signing certificates: {e}")
+
+        ttl = self.default_ttl
+        match = re.search(r"max-age=(\d+)", response.headers.get("Cache-Control", ""))
+        if match:
+            ttl = int(match.group(1))
+
+        keys = {kid: load_public_key(pem) for kid, pem in certs.items()}
+        return keys, time.time() + ttl
+
+
+class StaticKeySource(KeySource):
+    """
+    Serves a fixed key set, e.g. a locally generated RSA key pair in tests and benchmarks.
+    """
+
+    def __init__(self, keys: Dict[str, Any], ttl: float = 3600):
+        self.keys = {
+            kid: load_public_key(key) if isinstance(key, (str, bytes)) else key
+            for kid, key in keys.items()
+        }
+        self.ttl = ttl
+
+    def fetch(self) -> Tuple[Dict[str, Any], float]:
+        return dict(self.keys), time.time() + self.ttl
+
+
+class FirebaseTokenVerifier:
+    """
+    Verifies Firebase ID tokens without calling out to firebase_admin.
+
+    Decoded claims are cached by token hash until the token's exp claim, and the
+    signing keys are refreshed by a daemon thread refresh_margin seconds before expiry.
+    An unknown kid (key rotation) or an empty key set (cold start) triggers a synchronous
+    refresh at most once per forced_refresh_interval seconds; in between, unknown kids are
+    rejected, so forged headers cannot turn every request into a certificate fetch.
+    """
+
+    def __init__(self, project_id: str, key_source: KeySource = None,
+                 refresh_margin: float = 300, clock_skew: int = 0,
+                 claims_cache: Optional[ExpiringLRUCache] = None,
+                 forced_refresh_interval: float = 60):
+        if not project_id:
+            raise ValueError("project_id is required to verify Firebase ID tokens")
+        self.project_id = project_id
+        self.issuer = f"https://securetoken.google.com/{project_id}"
+        self.key_source = key_source or GoogleCertKeySource()
+        self.refresh_margin = refresh_margin
+        self.clock_skew = clock_skew
+        self.claims_cache = claims_cache if claims_cache is not None else ExpiringLRUCache(maxsize=4096)
+        self.forced_refresh_interval = forced_refresh_interval
+
+        self._keys: Dict[str, Any] = {}
+        self._keys_expire_at = 0.0
+        self._lock = threading.Lock()
+        self._refresh_thread = None
+        self._stop = threading.Event()
+        self._forced_refresh_lock = threading.Lock()
+        self._last_forced_refresh = float("-inf")
+        self.key_refreshes = 0
+        self.key_refresh_failures = 0
+        self.forced_refreshes_throttled = 0
+
+    # Key management
+
+    def refresh_keys(self) -> None:
+        """
+        Fetch a fresh key set from the key source and swap it in.
+
+        """
+        try:
+            keys, expires_at = self.key_source.fetch()
+        except Exception:
+            self.key_refresh_failures += 1
+            raise
+
+        with self._lock:
+            self._keys = keys
+            self._keys_expire_at = expires_at
+            self.key_refreshes += 1
+
+    def start(self) -> None:
+        """
+        Start the background refresh thread (idempotent).
+
+        """
+        if self._refresh_thread and self._refresh_thread.is_alive():
+            return
+        self._stop.clear()
+        self._refresh_thread = threading.Thread(
+            target=self._refresh_loop, name="firebase-key-refresh", daemon=True
+        )
+        self._refresh_thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _refresh_loop(self) -> None:
+        while not self._stop.is_set():
+            delay = self._keys_expire_at - self.refresh_margin - time.time()
+            if delay > 0:
+                self._stop.wait(delay)
+                continue
+            try:
+                self.refresh_keys()
+            except Exception:
+                # Keep serving the current keys and retry shortly
+                self._stop.wait(30)
+
+    def _get_key(self, kid: str):
+        key = self._keys.get(kid)
+        if key is not None:
+            return key
+
+        # Cold start or rotated key: refresh synchronously, but only one request per
+        # forced_refresh_interval does so; the background thread handles scheduled rotation
+        with self._forced_refresh_lock:
+            key = self._keys.get(kid)
+            if key is not None:
+                return key
+
+            now = time.monotonic()
+            if now - self._last_forced_refresh < self.forced_refresh_interval:
+                self.forced_refreshes_throttled += 1
+                if not self._keys:
+                    raise InvalidTokenError("Signing keys are not loaded yet")
+                raise InvalidTokenError("ID token has an unknown 'kid' header")
+            self._last_forced_refresh = now
+
+            try:
+                self.refresh_keys()
+            except Exception as e:
+                raise InvalidTokenError(f"Unable to load signing keys: {e}")
+
+        key = self._keys.get(kid)
+        if key is None:
+            raise InvalidTokenError("ID token has an unknown 'kid' header")
+        return key
+
+    # Verification
+
+    def verify(self, token: str) -> Dict[str, Any]:
+        """
+        Verify a Firebase ID token and return its claims (with 'uid' set like firebase_admin).
+        Raises InvalidTokenError on any failure.
+
+        """
+        if not token or not isinstance(token, str):
+            raise InvalidTokenError("ID token must be a non-empty string")
+
+        cache_key = hashlib.sha256(token.encode("utf-8")).hexdigest()
+        claims = self.claims_cache.get(cache_key)
+        if claims is not None:
+            return claims
+
+        try:
+            header = jwt.get_unverified_header(token)
+        except jwt.PyJWTError as e:
+            raise InvalidTokenError(f"Malformed ID token: {e}")
+
+        if header.get("alg") != "RS256":
+            raise InvalidTokenError("ID token has incorrect 'alg' header")
+        kid = header.get("kid")
+        if not kid:
+            raise InvalidTokenError("ID token has no 'kid' header")
+
+        try:
+            claims = jwt.decode(
+                token,
+                self._get_key(kid),
+                algorithms=["RS256"],
+                audience=self.project_id,
+                issuer=self.issuer,
+                leeway=self.clock_skew,
+                options={"require": ["exp", "iat", "aud", "iss", "sub"]},
+            )
+        except jwt.PyJWTError as e:
+            raise InvalidTokenError(f"Invalid ID token: {e}")
+
+        subject = claims.get("sub")
+        if not isinstance(subject, str) or not subject or len(subject) > 128:
+            raise InvalidTokenError("ID token has an invalid 'sub' claim")
+
+        auth_time = claims.get("auth_time")
+        if auth_time is not None and auth_time > time.time() + self.clock_skew:
+            raise InvalidTokenError("ID token has a future 'auth_time' claim")
+
+        claims["uid"] = subject
+        self.claims_cache.set(cache_key, claims, expires_at=float(claims["exp"]))
+        return claims
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Key set and claims cache counters for debugging and monitoring.
+
+        """
+        return {
+            "keys_loaded": len(self._keys),
+            "keys_expire_at": self._keys_expire_at,
+            "key_refreshes": self.key_refreshes,
+            "key_refresh_failures": self.key_refresh_failures,
+            "forced_refreshes_throttled": self.forced_refreshes_throttled,
+            "claims_cache": self.claims_cache.stats(),
+        }
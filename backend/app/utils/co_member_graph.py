@@ -0,0 +1,101 @@
+"""
+Optional in-memory co-membership graph: uid -> {peer uid: number of groups shared}.
+
+Answers "does this user already study with X" in O(degree) for the People Feed and the
+shared-memberships endpoint. GroupRepo keeps it current after committed member adds/removes
+and group deletions in this process; it is reloaded after max_age seconds to pick up writes
+made by other workers. Enable with CO_MEMBER_GRAPH=1; otherwise callers use the
+group_members self-join in GroupRepo.
+"""
+
+import os
+import threading
+import time
+from collections import Counter
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+CO_MEMBER_GRAPH_ENABLED = os.getenv("CO_MEMBER_GRAPH", "0").lower() in ("1", "true", "yes")
+
+
+class CoMemberGraph:
+    def __init__(self, max_age: float = 300):
+        self.max_age = max_age
+        self._members: Dict[int, Set[str]] = {}  # group_id -> member uids
+        self._adjacency: Dict[str, Counter] = {}  # uid -> Counter(peer uid -> shared group count)
+        self._lock = threading.RLock()
+        self._loaded_at: Optional[float] = None
+
+    def load(self, rows: Iterable[Tuple[int, str]]) -> None:
+        """
+        Replace the graph with (group_id, user_uid) membership rows.
+
+        """
+        members: Dict[int, Set[str]] = {}
+        for group_id, user_uid in rows:
+            members.setdefault(group_id, set()).add(user_uid)
+
+        adjacency: Dict[str, Counter] = {}
+        for uids in members.values():
+            for uid in uids:
+                peers = adjacency.setdefault(uid, Counter())
+                for peer_uid in uids:
+                    if peer_uid != uid:
+                        peers[peer_uid] += 1
+
+        with self._lock:
+            self._members = members
+            self._adjacency = adjacency
+            self._loaded_at = time.monotonic()
+
+    def needs_reload(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.max_age
+
+    def co_members(self, uid: str) -> Set[str]:
+        """
+        Uids sharing at least one group with uid.
+
+        """
+        with self._lock:
+            return set(self._adjacency.get(uid, ()))
+
+    def add_member(self, group_id: int, uid: str) -> None:
+        with self._lock:
+            uids = self._members.setdefault(group_id, set())
+            if uid in uids:
+                return
+            peers = self._adjacency.setdefault(uid, Counter())
+            for peer_uid in uids:
+                peers[peer_uid] += 1
+                self._adjacency.setdefault(peer_uid, Counter())[uid] += 1
+            uids.add(uid)
+
+    def remove_member(self, group_id: int, uid: str) -> None:
+        with self._lock:
+            uids = self._members.get(group_id)
+            if not uids or uid not in uids:
+                return
+            uids.discard(uid)
+            for peer_uid in uids:
+                self._unlink(uid, peer_uid)
+                self._unlink(peer_uid, uid)
+            if not uids:
+                del self._members[group_id]
+
+    def remove_group(self, group_id: int) -> None:
+        with self._lock:
+            for uid in list(self._members.get(group_id, ())):
+                self.remove_member(group_id, uid)
+
+    def _unlink(self, uid: str, peer_uid: str) -> None:
+        peers = self._adjacency.get(uid)
+        if peers is None:
+            return
+        peers[peer_uid] -= 1
+        if peers[peer_uid] <= 0:
+            del peers[peer_uid]
+        if not peers:
+            del self._adjacency[uid]
+
+
+# Process-wide graph used by GroupRepo (only maintained when enabled)
+co_member_graph = CoMemberGraph() if CO_MEMBER_GRAPH_ENABLED else None
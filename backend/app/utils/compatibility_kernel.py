@@ -0,0 +1,143 @@
+"""
+Vectorized compatibility scoring for whole-cohort batch jobs (analytics, precomputation).
+
+Uses the same rule as the People Feed (see app/utils/people_ranking.py):
+score = shared course count + 1 if both users are in the same grade,
+and only pairs sharing at least ONE course are emitted.
+
+Users are encoded as rows of a sparse 0/1 users x courses CSR matrix and their grade as a
+small integer code. Shared-course counts for a block of users come from one sparse product
+X[block] @ X[start:].T against the users from the block onwards (pairs with earlier users
+were already scored by earlier blocks), so each block only materializes pairs that actually
+share a course and roughly half the full rectangle is never computed.
+Blocks are scored on a multiprocessing pool, keeping memory bounded by the block size.
+"""
+
+import multiprocessing
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy import sparse
+
+
+class Cohort:
+    """
+    Encoded cohort: uids[i] is row i of the enrollment matrix and grades[i] its grade code.
+    """
+
+    def __init__(self, uids: np.ndarray, matrix: sparse.csr_matrix, grades: np.ndarray, course_ids: List[str]):
+        self.uids = uids
+        self.matrix = matrix
+        self.grades = grades
+        self.course_ids = course_ids
+
+    def __len__(self):
+        return len(self.uids)
+
+
+def encode_cohort(users: Iterable[Tuple[str, str, Sequence[str]]]) -> Cohort:
+    """
+    Encode (uid, grade value, [course_id, ...]) tuples into a Cohort.
+
+    """
+    uids = []
+    grade_codes: Dict[str, int] = {}
+    grades = []
+    course_index: Dict[str, int] = {}
+    indptr = [0]
+    indices = []
+
+    for uid, grade, courses in users:
+        uids.append(uid)
+        grades.append(grade_codes.setdefault(grade, len(grade_codes)))
+        for course_id in set(courses):
+            indices.append(course_index.setdefault(course_id, len(course_index)))
+        indptr.append(len(indices))
+
+    matrix = sparse.csr_matrix(
+        (np.ones(len(indices), dtype=np.int32), np.array(indices, dtype=np.int32), np.array(indptr, dtype=np.int64)),
+        shape=(len(uids), max(len(course_index), 1)),
+    )
+    course_ids = sorted(course_index, key=course_index.get)
+    return Cohort(np.array(uids, dtype=object), matrix, np.array(grades, dtype=np.int8), course_ids)
+
+
+# Per-process state, set once per worker by _init_worker
+_matrix = None
+_matrix_t = None
+_grades = None
+
+
+def _init_worker(matrix: sparse.csr_matrix, grades: np.ndarray) -> None:
+    global _matrix, _matrix_t, _grades
+    _matrix = matrix
+    _matrix_t = matrix.T.tocsc()
+    _grades = grades
+
+
+def _score_block(bounds: Tuple[int, int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Score rows [start, stop) against rows [start, n).
+    Returns (row index, col index, shared count, grade match) for pairs with row < col.
+
+    """
+    start, stop = bounds
+    # Only users from start onwards; slicing columns of the CSC transpose is cheap
+    shared = (_matrix[start:stop] @ _matrix_t[:, start:]).tocoo()
+
+    rows = shared.row.astype(np.int64) + start
+    cols = shared.col.astype(np.int64) + start
+
+    # Each unordered pair once, no self pairs
+    upper = cols > rows
+    rows, cols = rows[upper], cols[upper]
+    counts = shared.data[upper].astype(np.int32)
+    grade_match = _grades[rows] == _grades[cols]
+    return rows, cols, counts, grade_match
+
+
+def _blocks(n_users: int, block_size: int) -> List[Tuple[int, int]]:
+    return [(start, min(start + block_size, n_users)) for start in range(0, n_users, block_size)]
+
+
+def iter_pair_blocks(cohort: Cohort, block_size: int = 2048,
+                     processes: Optional[int] = None) -> Iterator[Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]]:
+    """
+    Yield scored blocks as (uid_a, uid_b, shared_course_count, grade_match) arrays.
+    processes=1 scores inline; otherwise blocks are fanned out to a multiprocessing pool.
+
+    """
+    if len(cohort) == 0:
+        return
+
+    blocks = _blocks(len(cohort), block_size)
+
+    if processes == 1 or len(blocks) == 1:
+        _init_worker(cohort.matrix, cohort.grades)
+        results = map(_score_block, blocks)
+        for rows, cols, counts, grade_match in results:
+            yield cohort.uids[rows], cohort.uids[cols], counts, grade_match
+        return
+
+    with multiprocessing.Pool(processes, initializer=_init_worker,
+                              initargs=(cohort.matrix, cohort.grades)) as pool:
+        for rows, cols, counts, grade_match in pool.imap(_score_block, blocks):
+            yield cohort.uids[rows], cohort.uids[cols], counts, grade_match
+
+
+def iter_pair_scores(cohort: Cohort, block_size: int = 2048,
+                     processes: Optional[int] = None) -> Iterator[Tuple[str, str, int, bool]]:
+    """
+    Row-at-a-time view of iter_pair_blocks: (uid_a, uid_b, shared_course_count, grade_match).
+
+    """
+    for uid_a, uid_b, counts, grade_match in iter_pair_blocks(cohort, block_size, processes):
+        yield from zip(uid_a, uid_b, counts.tolist(), grade_match.tolist())
+
+
+def scores(counts: np.ndarray, grade_match: np.ndarray) -> np.ndarray:
+    """
+    Combine a block's shared counts and grade matches into compatibility scores.
+
+    """
+    return counts.astype(np.float32) + grade_match.astype(np.float32)
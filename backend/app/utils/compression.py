@@ -0,0 +1,73 @@
+"""
+Negotiated response compression (brotli or gzip) for large API responses.
+
+Applied in an after_request hook: only successful, uncompressed, compressible responses
+at or above COMPRESS_MIN_SIZE bytes are encoded, using the best encoding the client
+accepts (br if the brotli package is installed, else gzip). Strong ETags become weak,
+since the encoded bytes differ from the identity representation.
+"""
+
+import gzip
+import os
+
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # optional, gzip is always available
+    brotli = None
+
+COMPRESS_MIN_SIZE = int(os.getenv("COMPRESS_MIN_SIZE", "1024"))
+GZIP_LEVEL = int(os.getenv("COMPRESS_GZIP_LEVEL", "6"))
+BROTLI_QUALITY = int(os.getenv("COMPRESS_BROTLI_QUALITY", "5"))
+
+COMPRESSIBLE_MIMETYPES = {"application/json", "application/msgpack", "text/html", "text/plain"}
+
+
+def compress(data: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=BROTLI_QUALITY)
+    return gzip.compress(data, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def choose_encoding(accept_encodings) -> str:
+    """
+    Pick br or gzip from the request's Accept-Encoding, or None.
+
+    """
+    if brotli is not None and accept_encodings["br"]:
+        return "br"
+    if accept_encodings["gzip"]:
+        return "gzip"
+    return None
+
+
+def init_compression(app, min_size: int = COMPRESS_MIN_SIZE):
+    @app.after_request
+    def compress_response(response):
+        response.vary.add("Accept-Encoding")
+
+        if (
+            response.status_code != 200
+            or response.direct_passthrough
+            or "Content-Encoding" in response.headers
+            or response.mimetype not in COMPRESSIBLE_MIMETYPES
+        ):
+            return response
+
+        data = response.get_data()
+        if len(data) < min_size:
+            return response
+
+        encoding = choose_encoding(request.accept_encodings)
+        if not encoding:
+            return response
+
+        response.set_data(compress(data, encoding))
+        response.headers["Content-Encoding"] = encoding
+
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            response.set_etag(etag, weak=True)
+
+        return response
@@ -0,0 +1,46 @@
+"""
+StudyBuddy Group Ranking (server side) for Group Feed
+
+Mirrors frontend/src/utils/groupRankingEngine.js so the browser receives pre-ranked pages.
+
+RANKING ALGORITHM:
+Groups are sorted by the count of courses they share with the user (highest first),
+then by newest group (id desc) so the order is total and pages are stable.
+Overlap is counted in SQL (GroupRepo.get_recommended_groups_for_user); pages are keyed with
+the cursor below.
+"""
+
+import base64
+import json
+from typing import List, Tuple
+
+
+def get_overlapping_courses(user_courses: List[str], group_courses: List[str]) -> List[str]:
+    """
+    Courses the group studies that the user takes, in the order of the user's course list.
+
+    """
+    group_course_ids = set(group_courses or [])
+    return [course_id for course_id in user_courses or [] if course_id in group_course_ids]
+
+
+def encode_cursor(overlap_count: int, group_id: int) -> str:
+    """
+    Opaque cursor pointing just after the given (overlap_count, group_id) position.
+
+    """
+    payload = json.dumps([overlap_count, group_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[int, int]:
+    """
+    Decode a cursor into (overlap_count, group_id). Raises ValueError if it was tampered with.
+
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        overlap_count, group_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return (int(overlap_count), int(group_id))
+    except Exception:
+        raise ValueError("Invalid cursor")
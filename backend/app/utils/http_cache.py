@@ -0,0 +1,72 @@
+"""
+HTTP caching helpers: content-hash ETags, Cache-Control and 304 Not Modified responses.
+Bodies are content negotiated (JSON or MessagePack, see msgpack_response.py); each
+representation gets its own ETag.
+"""
+
+import hashlib
+import json
+
+from flask import current_app, request
+
+from app.utils.msgpack_response import negotiated_response, wants_msgpack
+
+
+def json_etag(payload) -> str:
+    """
+    Stable content hash of a JSON-serializable payload, for use as a strong ETag.
+
+    """
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()[:32]
+
+
+def conditional_response(payload, etag: str = None, max_age: int = 0, private: bool = False):
+    """
+    Negotiated JSON or MessagePack response (see msgpack_response.py) with an ETag and
+    Cache-Control, or an empty 304 if the client's If-None-Match already has this ETag.
+    max_age=0 means "no-cache": the client may store the response but must revalidate it
+    on every use. Matching is weak, so ETags weakened by response compression still
+    revalidate.
+
+    """
+    etag = _representation_etag(etag or json_etag(payload))
+
+    if request.if_none_match.contains_weak(etag):
+        response = current_app.response_class(status=304)
+        response.vary.add("Accept")
+    else:
+        response = negotiated_response(payload)
+
+    return _with_cache_headers(response, etag, max_age, private)
+
+
+def not_modified(etag: str, max_age: int = 0, private: bool = True):
+    """
+    Return an empty 304 response if the client's If-None-Match has etag, else None.
+    Lets a route compare a cheap version stamp before running its full query.
+
+    """
+    etag = _representation_etag(etag)
+    if not request.if_none_match.contains_weak(etag):
+        return None
+    response = current_app.response_class(status=304)
+    response.vary.add("Accept")
+    return _with_cache_headers(response, etag, max_age, private)
+
+
+def _representation_etag(etag: str) -> str:
+    return f"{etag}-msgpack" if wants_msgpack() else etag
+
+
+def _with_cache_headers(response, etag, max_age, private):
+    response.set_etag(etag)
+    if private:
+        response.cache_control.private = True
+    else:
+        response.cache_control.public = True
+    if max_age:
+        response.cache_control.max_age = max_age
+    else:
+        response.cache_control.no_cache = True
+    return response
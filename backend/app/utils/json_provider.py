@@ -0,0 +1,79 @@
+"""
+Fast JSON provider for the Flask app (installed in create_app, used by every jsonify call).
+
+Backed by orjson when it is installed, with the stdlib encoder as fallback. Both encode
+datetime/date as ISO 8601 and Enum members as their value, so routes and models can hand
+over raw column values instead of converting them by hand.
+
+orjson always writes raw UTF-8, so it only serves providers with ensure_ascii turned off;
+with Flask's default (ensure_ascii=True) every call takes the stdlib path and non-ASCII
+text is escaped exactly as before.
+"""
+
+import enum
+import json
+from datetime import date, datetime
+from decimal import Decimal
+
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import orjson
+except ImportError:  # optional speedup
+    orjson = None
+
+
+def encode_fallback(value):
+    """
+    Conversions for types neither encoder handles natively the way the API expects.
+
+    """
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    orjson-backed provider; falls back to the stdlib json module (with the same conversions)
+    when orjson is missing, ensure_ascii is set, or for options orjson does not support.
+
+    """
+
+    def dumps(self, obj, **kwargs):
+        if self._use_orjson() and not kwargs:
+            return self._orjson_dumps(obj).decode("utf-8")
+
+        kwargs.setdefault("default", encode_fallback)
+        kwargs.setdefault("ensure_ascii", self.ensure_ascii)
+        kwargs.setdefault("sort_keys", self.sort_keys)
+        return json.dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if orjson is not None and not kwargs:
+            return orjson.loads(s)
+        return json.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        if not self._use_orjson():
+            return super().response(*args, **kwargs)
+
+        # Bytes straight from orjson, no str round trip
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._orjson_dumps(obj) + b"\n", mimetype=self.mimetype)
+
+    def _use_orjson(self) -> bool:
+        # orjson has no ASCII-escaping option
+        return orjson is not None and not self.ensure_ascii
+
+    def _orjson_dumps(self, obj) -> bytes:
+        option = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=encode_fallback, option=option)
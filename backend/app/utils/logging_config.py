@@ -0,0 +1,173 @@
+"""
+Non-blocking structured logging for the "app" logger tree.
+
+Request threads only put records on an in-memory queue (QueueHandler); a QueueListener
+thread formats them and writes them to stderr, so log I/O never runs on the request path.
+Records logged during a request are stamped with uid, method and route on the request thread
+before they are queued. Extra structured fields are passed through `extra`, e.g.
+logger.info("Member added", extra={"group_id": 3, "member_uid": uid}).
+
+Environment:
+    LOG_LEVEL       default level of the "app" loggers (default INFO)
+    LOG_LEVELS      per-module overrides, e.g. "app.repositories.group_repo=DEBUG,app.firebase_auth=WARNING"
+    LOG_FORMAT      "text" (default) or "json" (one JSON object per line)
+    LOG_QUEUE_SIZE  maximum queued records before new ones are dropped (default 10000)
+
+Use %-style arguments (logger.debug("x %s", value)) rather than f-strings so that disabled
+levels skip message formatting entirely.
+"""
+
+import atexit
+import json
+import logging
+import os
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+from typing import Dict, Optional
+
+from flask import g, has_request_context, request
+
+APP_LOGGER = "app"
+
+# Attributes every LogRecord has; anything else on a record came from `extra` or the context filter
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime", "taskName"}
+
+_listener: Optional[QueueListener] = None
+
+
+class RequestContextFilter(logging.Filter):
+    """
+    Add uid, method and route from the current request (if any) to each record.
+
+    """
+    def filter(self, record: logging.LogRecord) -> bool:
+        if has_request_context():
+            record.uid = g.get("firebase_uid")
+            record.method = request.method
+            record.route = request.url_rule.rule if request.url_rule is not None else request.path
+        return True
+
+
+class StructuredQueueHandler(QueueHandler):
+    """
+    QueueHandler that drops records when the queue is full instead of blocking the caller,
+    and renders the message and traceback before queueing so the record pickles cleanly
+    and keeps its structured fields.
+
+    """
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            pass
+
+
+class TextFormatter(logging.Formatter):
+    """
+    Standard text line followed by the structured fields as key=value pairs.
+
+    """
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        fields = structured_fields(record)
+        if not fields:
+            return line
+        head, _, tail = line.partition("\n")
+        pairs = " ".join(f"{key}={value}" for key, value in fields.items())
+        return f"{head} [{pairs}]" + (f"\n{tail}" if tail else "")
+
+
+class JSONFormatter(logging.Formatter):
+    """
+    One JSON object per record: ts, level, logger, message, structured fields and exc.
+
+    """
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        entry.update(structured_fields(record))
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+def structured_fields(record: logging.LogRecord) -> Dict[str, object]:
+    return {
+        key: value
+        for key, value in vars(record).items()
+        if key not in _RECORD_ATTRIBUTES and value is not None
+    }
+
+
+def parse_levels(spec: str) -> Dict[str, int]:
+    """
+    Parse "module=LEVEL,module=LEVEL" into {logger name: level}, ignoring malformed entries.
+
+    """
+    levels = {}
+    for item in (spec or "").split(","):
+        name, _, level = item.partition("=")
+        level = logging.getLevelName(level.strip().upper())
+        if name.strip() and isinstance(level, int):
+            levels[name.strip()] = level
+    return levels
+
+
+def init_logging() -> None:
+    """
+    Route the "app" logger tree through a queue drained by a background listener thread.
+    Safe to call more than once (every create_app call); only the first call installs handlers.
+    Called before the Flask app logger is first used, so Flask adds no default handler of its own.
+
+    """
+    global _listener
+    if _listener is not None:
+        return
+
+    formatter = JSONFormatter() if os.getenv("LOG_FORMAT", "text").lower() == "json" else TextFormatter()
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(formatter)
+
+    log_queue = queue.Queue(maxsize=int(os.getenv("LOG_QUEUE_SIZE", "10000")))
+    queue_handler = StructuredQueueHandler(log_queue)
+    queue_handler.addFilter(RequestContextFilter())
+
+    root = logging.getLogger(APP_LOGGER)
+    root.handlers = [h for h in root.handlers if not isinstance(h, StructuredQueueHandler)]
+    root.setLevel(parse_levels(f"{APP_LOGGER}={os.getenv('LOG_LEVEL', 'INFO')}").get(APP_LOGGER, logging.INFO))
+    root.addHandler(queue_handler)
+    root.propagate = False
+    for name, level in parse_levels(os.getenv("LOG_LEVELS", "")).items():
+        logging.getLogger(name).setLevel(level)
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def shutdown_logging() -> None:
+    """
+    Flush queued records and stop the listener thread.
+
+    """
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -0,0 +1,106 @@
+"""
+Thread-safe LRU cache with optional per-entry expiry.
+Shared by the in-process caches that must stay bounded (verified tokens, lookups, etc.)
+
+"""
+
+import threading
+import time
+from collections import OrderedDict
+
+
+class ExpiringLRUCache:
+    """
+    Bounded mapping that evicts the least recently used entry once full.
+    Entries may carry an absolute expiry (epoch seconds) or inherit the default TTL.
+    Hit/miss counters are kept so cache effectiveness can be inspected at runtime.
+
+    """
+
+    def __init__(self, maxsize: int = 1024, default_ttl: float = None):
+        if maxsize <= 0:
+            raise ValueError("maxsize must be positive")
+        self.maxsize = maxsize
+        self.default_ttl = default_ttl
+        self._data = OrderedDict()  # key -> (value, expires_at)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key, default=None):
+        """
+        Return the cached value and mark it as recently used, or default on miss/expiry.
+
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= now:
+                del self._data[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, expires_at: float = None):
+        """
+        Store a value. Entries already past expires_at are not stored.
+
+        """
+        if expires_at is None and self.default_ttl is not None:
+            expires_at = time.time() + self.default_ttl
+        if expires_at is not None and expires_at <= time.time():
+            return
+
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+            self._data[key] = (value, expires_at)
+
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key, default=None):
+        """
+        Remove an entry (used for explicit invalidation).
+
+        """
+        with self._lock:
+            entry = self._data.pop(key, None)
+        return entry[0] if entry is not None else default
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
+
+    def stats(self) -> dict:
+        """
+        Snapshot of cache counters for debugging and monitoring.
+
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            }
@@ -0,0 +1,36 @@
+"""
+MessagePack responses via content negotiation.
+
+List-heavy endpoints answer with application/msgpack when the client's Accept header
+prefers it over application/json, and with JSON otherwise (including */* and no Accept).
+Enum and datetime values get the same conversions as the JSON provider.
+"""
+
+import msgpack
+from flask import current_app, jsonify, request
+
+from app.utils.json_provider import encode_fallback
+
+MSGPACK_MIMETYPE = "application/msgpack"
+
+
+def wants_msgpack() -> bool:
+    return request.accept_mimetypes.best_match(["application/json", MSGPACK_MIMETYPE]) == MSGPACK_MIMETYPE
+
+
+def packb(payload) -> bytes:
+    return msgpack.packb(payload, default=encode_fallback, use_bin_type=True)
+
+
+def negotiated_response(payload, status: int = 200):
+    """
+    MessagePack or JSON response for payload, chosen from the Accept header.
+
+    """
+    if wants_msgpack():
+        response = current_app.response_class(packb(payload), status=status, mimetype=MSGPACK_MIMETYPE)
+    else:
+        response = jsonify(payload)
+        response.status_code = status
+    response.vary.add("Accept")
+    return response
@@ -0,0 +1,81 @@
+"""
+StudyBuddy People Ranking Engine (server side) for People Feed
+
+The single source of People Feed ranking; the browser receives pre-ranked pages
+from /api/users/feed/.
+
+COMPATIBILITY SCORE CALCULATION:
+1. SHARED COURSES COUNT (Weight: 1.0 per course)
+2. GRADE LEVEL MATCH (Weight: 1.0)
+
+Only users who share at least ONE course with the current user are ranked.
+Scores are precomputed per pair in the user_compatibility table (see CompatibilityRepo),
+so a feed page is an index range scan ordered by score (desc), then uid, paged with
+the feed cursor below. Username search pages use the (score, username, uid) cursor.
+"""
+
+import base64
+import json
+from typing import List, Optional, Tuple
+
+SHARED_COURSE_WEIGHT = 1.0
+GRADE_MATCH_WEIGHT = 1.0
+
+
+def calculate_score(shared_count: int, same_grade: bool) -> float:
+    """
+    Score of one pair: shared courses times their weight, plus the grade-match bonus.
+
+    """
+    score = shared_count * SHARED_COURSE_WEIGHT
+    if same_grade:
+        score += GRADE_MATCH_WEIGHT
+    return round(score, 2)
+
+
+def get_shared_courses(user_courses: List[str], target_courses: List[str]) -> List[str]:
+    """
+    Courses both users take, in the order of the current user's course list.
+
+    """
+    target = set(target_courses or [])
+    return [course_id for course_id in user_courses or [] if course_id in target]
+
+
+def encode_cursor(score: float, username: Optional[str], uid: str) -> str:
+    """
+    Opaque cursor pointing just after the given (score, username, uid) position.
+
+    """
+    payload = json.dumps([score, username or "", uid], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[float, str, str]:
+    """
+    Decode a cursor into (score, username, uid). Raises ValueError if it was tampered with.
+
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        score, username, uid = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return (float(score), str(username), str(uid))
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def encode_feed_cursor(score: float, uid: str) -> str:
+    """
+    Opaque People Feed cursor pointing just after the given (score, uid) position.
+
+    """
+    return encode_cursor(score, None, uid)
+
+
+def decode_feed_cursor(cursor: str) -> Tuple[float, str]:
+    """
+    Decode a People Feed cursor into (score, uid). Raises ValueError if it was tampered with.
+
+    """
+    score, _, uid = decode_cursor(cursor)
+    return (score, uid)
@@ -0,0 +1,25 @@
+"""
+Parsing helpers for list-valued query string parameters.
+"""
+
+from typing import List, Optional
+
+from flask import request
+
+# Most uids one request may be narrowed to, e.g. the users on one People Feed page
+MAX_UIDS = 100
+
+
+def parse_uid_list(name: str = "uids", max_count: int = MAX_UIDS) -> Optional[List[str]]:
+    """
+    Sorted, de-duplicated list of the comma-separated uids in ?<name>=, or None if the
+    parameter is absent. Raises ValueError if more than max_count uids are given.
+
+    """
+    raw = request.args.get(name)
+    if raw is None:
+        return None
+    uids = sorted({uid.strip() for uid in raw.split(",") if uid.strip()})
+    if len(uids) > max_count:
+        raise ValueError(f"{name} accepts at most {max_count} values")
+    return uids
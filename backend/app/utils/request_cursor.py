@@ -0,0 +1,34 @@
+"""
+Keyset cursors for direct request inbox pages.
+
+Inbox pages are ordered newest first by (created_at, id) and backed by the
+(receiver_uid / sender_uid, [status,] created_at, id) indexes on direct_requests,
+so each page is a single index range scan regardless of how deep the client pages.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Tuple
+
+
+def encode_cursor(created_at: datetime, request_id: int) -> str:
+    """
+    Opaque cursor pointing just after the given (created_at, id) position.
+
+    """
+    payload = json.dumps([created_at.isoformat(), request_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    """
+    Decode a cursor into (created_at, id). Raises ValueError if it was tampered with.
+
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        created_at, request_id = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return (datetime.fromisoformat(created_at), int(request_id))
+    except Exception:
+        raise ValueError("Invalid cursor")
@@ -0,0 +1,291 @@
+"""
+In-memory username index for availability checks, autocomplete and fuzzy search.
+
+Holds an exact username -> uid map plus a sorted array of lowercased usernames for
+prefix lookups (bisect), so signup-form keystrokes never reach the database.
+The index is loaded on first use, kept current by UserRepo writes in this process and
+reloaded in the background after max_age seconds to pick up writes made by other workers;
+readers keep using the previous snapshot while a reload runs.
+The users.username unique constraint remains the final authority.
+
+Fuzzy search uses trigrams built the way pg_trgm does it: lowercase, split into
+alphanumeric words, pad each word with two leading spaces and one trailing space.
+Similarity is shared / (|a| + |b| - shared). Every username gets an integer slot and
+each trigram a posting list of slots; a query concatenates the posting lists of its
+trigrams and counts shared trigrams per slot with one np.bincount.
+"""
+
+import bisect
+import heapq
+import logging
+import re
+import threading
+import time
+from typing import Callable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+SIMILARITY_THRESHOLD = 0.3  # pg_trgm default
+
+RELOAD_RETRY_DELAY = 30  # seconds between attempts after a failed background reload
+
+_WORD_RE = re.compile(r"[^\W_]+")
+
+logger = logging.getLogger(__name__)
+
+
+def trigrams(text: str) -> frozenset:
+    """
+    pg_trgm-style trigram set of text.
+
+    """
+    grams = set()
+    for word in _WORD_RE.findall(text.lower()):
+        padded = f"  {word} "
+        grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return frozenset(grams)
+
+
+class UsernameIndex:
+    def __init__(self, max_age: float = 300):
+        self.max_age = max_age
+        self._by_username = {}  # username -> uid
+        self._sorted: List[Tuple[str, str]] = []  # (username.lower(), username)
+        self._slots = {}  # username -> slot
+        self._slot_usernames: List[Optional[str]] = []  # slot -> username (None when free)
+        self._free_slots: List[int] = []
+        self._gram_counts = np.zeros(0, dtype=np.int32)  # slot -> number of trigrams
+        self._postings = {}  # trigram -> set of slots
+        self._posting_arrays = {}  # trigram -> np.ndarray of slots, rebuilt lazily after writes
+        self._lock = threading.RLock()
+        self._reload_lock = threading.Lock()  # single-flight guard for (re)loads
+        self._journal: Optional[list] = None  # writes made while a reload is running
+        self._loaded_at: Optional[float] = None
+        self._next_attempt = 0.0
+
+    def load(self, rows: Iterable[Tuple[str, str]]) -> None:
+        """
+        Replace the index contents with (username, uid) rows.
+
+        """
+        state = self._build(rows)
+        with self._lock:
+            self._swap(state)
+
+    def _build(self, rows: Iterable[Tuple[str, str]]) -> tuple:
+        by_username = {username: uid for username, uid in rows}
+        ordered = sorted((username.lower(), username) for username in by_username)
+
+        slot_usernames = list(by_username)
+        gram_counts = np.zeros(len(slot_usernames), dtype=np.int32)
+        postings = {}
+        for slot, username in enumerate(slot_usernames):
+            username_grams = trigrams(username)
+            gram_counts[slot] = len(username_grams)
+            for gram in username_grams:
+                postings.setdefault(gram, set()).add(slot)
+
+        return by_username, ordered, slot_usernames, gram_counts, postings
+
+    def _swap(self, state: tuple) -> None:
+        by_username, ordered, slot_usernames, gram_counts, postings = state
+        self._by_username = by_username
+        self._sorted = ordered
+        self._slots = {username: slot for slot, username in enumerate(slot_usernames)}
+        self._slot_usernames = slot_usernames
+        self._free_slots = []
+        self._gram_counts = gram_counts
+        self._postings = postings
+        self._posting_arrays = {}
+        self._loaded_at = time.monotonic()
+
+    def needs_reload(self) -> bool:
+        if self._loaded_at is None:
+            return True
+        now = time.monotonic()
+        return now - self._loaded_at > self.max_age and now >= self._next_attempt
+
+    def ensure_fresh(self, loader: Callable[[], Iterable[Tuple[str, str]]]) -> "UsernameIndex":
+        """
+        Make the index usable and schedule a reload from loader() once it is stale.
+        The first load runs synchronously and concurrent callers wait for it; later reloads
+        run on a background thread, one at a time, while readers use the current snapshot.
+
+        """
+        if not self.needs_reload():
+            return self
+
+        if self._loaded_at is None:
+            with self._reload_lock:
+                if self._loaded_at is None:
+                    self._reload(loader)
+            return self
+
+        if self._reload_lock.acquire(blocking=False):
+            try:
+                threading.Thread(
+                    target=self._reload_in_background, args=(loader,), name="username-index-reload", daemon=True
+                ).start()
+            except Exception:
+                self._reload_lock.release()
+                raise
+        return self
+
+    def _reload_in_background(self, loader: Callable[[], Iterable[Tuple[str, str]]]) -> None:
+        try:
+            self._reload(loader)
+        except Exception:
+            self._next_attempt = time.monotonic() + RELOAD_RETRY_DELAY
+            logger.exception("Username index reload failed; serving the previous snapshot")
+        finally:
+            self._reload_lock.release()
+
+    def _reload(self, loader: Callable[[], Iterable[Tuple[str, str]]]) -> None:
+        # Writes made in this process while the rows are read and indexed are replayed
+        # on top of the new snapshot, so they are not lost when it is swapped in
+        with self._lock:
+            self._journal = []
+        try:
+            state = self._build(loader())
+            with self._lock:
+                journal, self._journal = self._journal, None
+                self._swap(state)
+                for method, args in journal:
+                    method(*args)
+        finally:
+            self._journal = None
+
+    def lookup(self, username: str) -> Optional[str]:
+        """
+        Return the uid owning the exact username, or None.
+
+        """
+        return self._by_username.get(username)
+
+    def add(self, username: str, uid: str) -> None:
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append((self.add, (username, uid)))
+            if username in self._by_username:
+                self._by_username[username] = uid
+                return
+            self._by_username[username] = uid
+            bisect.insort(self._sorted, (username.lower(), username))
+
+            if self._free_slots:
+                slot = self._free_slots.pop()
+                self._slot_usernames[slot] = username
+            else:
+                slot = len(self._slot_usernames)
+                self._slot_usernames.append(username)
+                if slot >= len(self._gram_counts):
+                    self._gram_counts = np.resize(self._gram_counts, max(16, 2 * len(self._gram_counts)))
+            self._slots[username] = slot
+
+            username_grams = trigrams(username)
+            self._gram_counts[slot] = len(username_grams)
+            for gram in username_grams:
+                self._postings.setdefault(gram, set()).add(slot)
+                self._posting_arrays.pop(gram, None)
+
+    def remove(self, username: str) -> None:
+        with self._lock:
+            if self._journal is not None:
+                self._journal.append((self.remove, (username,)))
+            if self._by_username.pop(username, None) is None:
+                return
+            entry = (username.lower(), username)
+            position = bisect.bisect_left(self._sorted, entry)
+            if position < len(self._sorted) and self._sorted[position] == entry:
+                del self._sorted[position]
+
+            slot = self._slots.pop(username)
+            for gram in trigrams(username):
+                posting = self._postings.get(gram)
+                if posting is not None:
+                    posting.discard(slot)
+                    if not posting:
+                        del self._postings[gram]
+                self._posting_arrays.pop(gram, None)
+            self._slot_usernames[slot] = None
+            self._gram_counts[slot] = 0
+            self._free_slots.append(slot)
+
+    def rename(self, old_username: Optional[str], new_username: str, uid: str) -> None:
+        with self._lock:
+            if old_username and self._by_username.get(old_username) == uid:
+                self.remove(old_username)
+            self.add(new_username, uid)
+
+    def prefix(self, prefix: str, limit: int = 10) -> List[str]:
+        """
+        Usernames starting with prefix (case-insensitive), in alphabetical order.
+
+        """
+        key = prefix.lower()
+        with self._lock:
+            position = bisect.bisect_left(self._sorted, (key, ""))
+            matches = []
+            while position < len(self._sorted) and len(matches) < limit:
+                lowered, username = self._sorted[position]
+                if not lowered.startswith(key):
+                    break
+                matches.append(username)
+                position += 1
+            return matches
+
+    def search(
+        self,
+        query: str,
+        limit: int = 20,
+        after: Optional[Tuple[float, str, str]] = None,
+        threshold: float = SIMILARITY_THRESHOLD,
+        exclude_uid: Optional[str] = None,
+    ) -> List[Tuple[float, str, str]]:
+        """
+        Fuzzy match usernames against query.
+        Returns up to limit (similarity, username, uid) rows ordered by similarity desc,
+        then username, then uid; after is the last row of the previous page.
+
+        """
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+
+        with self._lock:
+            arrays = [self._posting_array(gram) for gram in query_grams if gram in self._postings]
+            if not arrays:
+                return []
+
+            shared = np.bincount(np.concatenate(arrays), minlength=len(self._slot_usernames))
+            slots = np.flatnonzero(shared)
+            counts = shared[slots]
+            similarity = np.round(counts / (len(query_grams) + self._gram_counts[slots] - counts), 4)
+            keep = similarity >= threshold
+
+            matches = []
+            for slot, value in zip(slots[keep].tolist(), similarity[keep].tolist()):
+                username = self._slot_usernames[slot]
+                uid = self._by_username[username]
+                if uid != exclude_uid:
+                    matches.append((-value, username, uid))
+
+        if after:
+            after_key = (-after[0], after[1], after[2])
+            matches = [match for match in matches if match > after_key]
+
+        return [(-negated, username, uid) for negated, username, uid in heapq.nsmallest(limit, matches)]
+
+    def _posting_array(self, gram: str) -> np.ndarray:
+        array = self._posting_arrays.get(gram)
+        if array is None:
+            array = np.fromiter(self._postings[gram], dtype=np.int64)
+            self._posting_arrays[gram] = array
+        return array
+
+    def __len__(self):
+        return len(self._by_username)
+
+
+# Process-wide index used by UserRepo
+username_index = UsernameIndex()
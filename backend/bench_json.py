@@ -0,0 +1,92 @@
+"""
+Benchmark for the JSON provider and response compression (app/utils/json_provider.py,
+app/utils/compression.py). Serializes synthetic People Feed / Group Feed payloads with
+Flask's default provider and the fast provider, and reports bytes on the wire per encoding.
+Does not touch the database.
+
+Usage: python bench_json.py [--sizes 1000 10000] [--repeat 5]
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+
+from flask import Flask
+from flask.json.provider import DefaultJSONProvider
+
+from app.utils.compression import brotli, compress
+from app.utils.json_provider import FastJSONProvider, orjson
+
+COURSES = ["CSE1001", "CSE2010", "CSE2410", "CSE4001", "PHY2002", "MTH2001", "MTH2201", "CHM1101"]
+
+
+def users_payload(count, rng):
+    return {"users": [
+        {
+            "uid": f"uid{i:08d}",
+            "username": f"student_{i}",
+            "email": f"student_{i}@example.edu",
+            "date_of_birth": (datetime(2000, 1, 1) + timedelta(days=rng.randrange(3000))).date().isoformat(),
+            "grade": rng.choice(["freshman", "sophomore", "junior", "senior"]),
+            "gender": rng.choice(["male", "female", "non_binary"]),
+            "courses": rng.sample(COURSES, rng.randint(1, 5)),
+        }
+        for i in range(count)
+    ]}
+
+
+def groups_payload(count, rng):
+    now = datetime(2026, 1, 1)
+    return {"user_courses": COURSES[:3], "groups": [
+        {
+            "id": i,
+            "name": f"Study group {i}",
+            "description": "Weekly problem sessions before the midterm. " * rng.randint(0, 3),
+            "is_visible": True,
+            "privacy": rng.choice(["public", "private"]),
+            "created_at": (now - timedelta(minutes=i)).isoformat(),
+            "updated_at": now.isoformat(),
+            "member_count": rng.randint(1, 30),
+            "courses": [{"course_id": c, "title": c} for c in rng.sample(COURSES, rng.randint(1, 3))],
+            "overlapping_courses": COURSES[:1],
+            "overlap_count": 1,
+        }
+        for i in range(count)
+    ]}
+
+
+def best_of(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = fn()
+        timings.append(time.perf_counter() - started)
+    return min(timings) * 1000, result
+
+
+def run(sizes, repeat):
+    app = Flask(__name__)
+    providers = {"stdlib": DefaultJSONProvider(app), "fast": FastJSONProvider(app)}
+    encodings = ["gzip"] + (["br"] if brotli is not None else [])
+    print(f"orjson: {'yes' if orjson else 'no (stdlib fallback)'}, brotli: {'yes' if brotli else 'no'}")
+
+    rng = random.Random(7)
+    for size in sizes:
+        for name, payload in (("users", users_payload(size, rng)), ("groups", groups_payload(size, rng))):
+            print(f"{name} x {size}")
+            body = None
+            for label, provider in providers.items():
+                elapsed, body = best_of(lambda: provider.response(payload).get_data(), repeat)
+                print(f"  - {label:<7} serialize {elapsed:8.2f} ms   {len(body):>10,} bytes")
+            for encoding in encodings:
+                elapsed, encoded = best_of(lambda: compress(body, encoding), repeat)
+                print(f"  - {encoding:<7} compress  {elapsed:8.2f} ms   {len(encoded):>10,} bytes on the wire")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark JSON serialization and compression")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat)
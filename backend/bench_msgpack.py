@@ -0,0 +1,44 @@
+"""
+Benchmark for MessagePack responses (app/utils/msgpack_response.py). Encodes the synthetic
+People Feed / Group Feed payloads from bench_json.py as JSON (fast provider) and as
+MessagePack, and reports encode time and payload size, raw and gzip-compressed.
+Does not touch the database.
+
+Usage: python bench_msgpack.py [--sizes 1000 10000] [--repeat 5]
+"""
+
+import argparse
+import random
+
+from flask import Flask
+
+from app.utils.compression import compress
+from app.utils.json_provider import FastJSONProvider
+from app.utils.msgpack_response import packb
+from bench_json import best_of, groups_payload, users_payload
+
+
+def run(sizes, repeat):
+    app = Flask(__name__)
+    provider = FastJSONProvider(app)
+    encoders = {
+        "json": lambda payload: provider.dumps(payload).encode("utf-8"),
+        "msgpack": packb,
+    }
+
+    rng = random.Random(7)
+    for size in sizes:
+        for name, payload in (("users", users_payload(size, rng)), ("groups", groups_payload(size, rng))):
+            print(f"{name} x {size}")
+            for label, encode in encoders.items():
+                elapsed, body = best_of(lambda: encode(payload), repeat)
+                gzipped = compress(body, "gzip")
+                print(f"  - {label:<8} encode {elapsed:8.2f} ms   {len(body):>10,} bytes   {len(gzipped):>9,} gzip")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark MessagePack against JSON encoding")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+    run(args.sizes, args.repeat)
@@ -0,0 +1,76 @@
+"""
+Benchmark for the in-memory username index (app/utils/username_index.py).
+Builds the index over synthetic usernames and times fuzzy search, prefix
+autocomplete and exact lookups. Does not touch the database.
+
+Usage: python bench_username_search.py [--users 100000] [--queries 500] [--seed 7]
+"""
+
+import argparse
+import random
+import statistics
+import string
+import time
+
+from app.utils.username_index import UsernameIndex
+
+SYLLABLES = ["al", "ex", "an", "dra", "jo", "shu", "ma", "ri", "ka", "ven", "li", "son", "ta", "mi", "ro", "ne"]
+
+
+def synthetic_usernames(count, rng):
+    """Return count unique, name-like usernames."""
+    usernames = set()
+    while len(usernames) < count:
+        name = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+        suffix = "".join(rng.choice(string.digits) for _ in range(rng.randint(0, 3)))
+        usernames.add(name + rng.choice(["", "_", "."]) + suffix)
+    return sorted(usernames)
+
+
+def misspell(username, rng):
+    """Drop, swap or replace one character so queries exercise the fuzzy path."""
+    chars = list(username)
+    position = rng.randrange(len(chars))
+    operation = rng.choice(["drop", "swap", "replace"])
+    if operation == "drop" and len(chars) > 3:
+        del chars[position]
+    elif operation == "swap" and position + 1 < len(chars):
+        chars[position], chars[position + 1] = chars[position + 1], chars[position]
+    else:
+        chars[position] = rng.choice(string.ascii_lowercase)
+    return "".join(chars)
+
+
+def timed(label, fn, inputs):
+    durations = []
+    for value in inputs:
+        started = time.perf_counter()
+        fn(value)
+        durations.append((time.perf_counter() - started) * 1000)
+    durations.sort()
+    p95 = durations[int(len(durations) * 0.95) - 1]
+    print(f"  - {label:<10} p50 {statistics.median(durations):7.3f} ms   p95 {p95:7.3f} ms   max {durations[-1]:7.3f} ms")
+
+
+def run(user_count, query_count, seed):
+    rng = random.Random(seed)
+    usernames = synthetic_usernames(user_count, rng)
+
+    index = UsernameIndex()
+    started = time.perf_counter()
+    index.load((username, f"uid{i}") for i, username in enumerate(usernames))
+    print(f"Indexed {len(index)} usernames in {time.perf_counter() - started:.2f}s")
+
+    samples = [rng.choice(usernames) for _ in range(query_count)]
+    timed("search", lambda q: index.search(q, 20), [misspell(username, rng) for username in samples])
+    timed("prefix", lambda q: index.prefix(q, 10), [username[:3] for username in samples])
+    timed("lookup", index.lookup, samples)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark username search over synthetic users")
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--queries", type=int, default=500)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+    run(args.users, args.queries, args.seed)
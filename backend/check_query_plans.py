@@ -0,0 +1,276 @@
+"""
+Query-plan regression check for the repository read paths.
+
+Calls each hot repository read method against a local PostgreSQL database, captures the
+SELECT statements it issues, runs EXPLAIN (FORMAT JSON) on each one and fails if any plan
+sequentially scans a table holding at least --min-rows rows.
+
+By default a synthetic cohort is seeded first, inside an outer transaction that is rolled
+back at the end (repository commits become savepoints), so the check can run against a dev
+database without leaving rows behind. Apply the migrations first (flask db upgrade) so the
+indexes under test exist. Pass --no-seed to check plans against the data already there.
+
+The default cohort puts every table the checks filter on (including groups and group_courses,
+seeded at --groups, default users / 2) above the default --min-rows, so each index is exercised.
+tests/test_query_plans.py runs the same check under pytest when TEST_POSTGRES_URL is set.
+
+Usage: python check_query_plans.py [--users 20000] [--groups N] [--min-rows 5000] [--no-seed] [--verbose]
+Exits with status 1 if any check fails, 2 if DATABASE_URL is not PostgreSQL.
+"""
+
+import argparse
+import random
+import sys
+from datetime import date, datetime, timedelta
+from types import SimpleNamespace
+
+from sqlalchemy import event, func, select
+from sqlalchemy.orm import scoped_session, sessionmaker
+
+from app import create_app, db
+from app.models.compatibility import UserCompatibility
+from app.models.direct_request import DirectRequest, RequestStatus
+from app.models.group import Group, GroupMember, GroupPrivacy, GroupRole, group_courses
+from app.models.group_request import GroupRequest, GroupRequestStatus
+from app.models.user import Course, Gender, Grade, User, UserCourse, UserProfile
+from app.repositories.compatibility_repo import CompatibilityRepo
+from app.repositories.direct_request_repo import DirectRequestRepo
+from app.repositories.group_repo import GroupRepo
+from app.repositories.group_request_repo import GroupRequestRepo
+from app.repositories.user_repo import UserRepo
+
+COURSE_COUNT = 60
+PEERS_PER_USER = 20
+
+# (name, callable taking the sample namespace); each is one repository read path
+CHECKS = [
+    ("DirectRequestRepo.get_incoming_page", lambda s: DirectRequestRepo.get_incoming_page(s.uid)),
+    ("DirectRequestRepo.get_incoming_page[pending]",
+     lambda s: DirectRequestRepo.get_incoming_page(s.uid, RequestStatus.PENDING)),
+    ("DirectRequestRepo.get_outgoing_page", lambda s: DirectRequestRepo.get_outgoing_page(s.uid)),
+    ("DirectRequestRepo.get_outgoing_page[pending]",
+     lambda s: DirectRequestRepo.get_outgoing_page(s.uid, RequestStatus.PENDING)),
+    ("DirectRequestRepo.get_incoming_version", lambda s: DirectRequestRepo.get_incoming_version(s.uid)),
+    ("DirectRequestRepo.get_outgoing_version", lambda s: DirectRequestRepo.get_outgoing_version(s.uid)),
+    ("GroupRepo.get_user_groups", lambda s: GroupRepo.get_user_groups(s.uid)),
+    ("GroupRepo.get_user_groups_version", lambda s: GroupRepo.get_user_groups_version(s.uid)),
+    ("GroupRepo.get_group_details_for_member", lambda s: GroupRepo.get_group_details_for_member(s.group_id, s.uid)),
+    ("GroupRepo.get_member_role", lambda s: GroupRepo.get_member_role(s.group_id, s.uid)),
+    ("GroupRepo.get_group_members", lambda s: GroupRepo.get_group_members(s.group_id)),
+    ("GroupRepo.get_shared_membership_uids", lambda s: GroupRepo.get_shared_membership_uids(s.uid)),
+    ("GroupRepo.get_groups_by_course", lambda s: GroupRepo.get_groups_by_course(s.course_id)),
+    ("GroupRepo.get_recommended_groups_for_user", lambda s: GroupRepo.get_recommended_groups_for_user(s.uid)),
+    ("GroupRequestRepo.get_pending_requests_for_group",
+     lambda s: GroupRequestRepo.get_pending_requests_for_group(s.group_id)),
+    ("GroupRequestRepo.get_user_pending_requests", lambda s: GroupRequestRepo.get_user_pending_requests(s.uid)),
+    ("UserRepo.get_user", lambda s: UserRepo.get_user(s.uid)),
+    ("UserRepo.get_ranked_people_feed", lambda s: UserRepo.get_ranked_people_feed(s.uid)),
+    ("CompatibilityRepo.get_ranked_peers", lambda s: CompatibilityRepo.get_ranked_peers(s.uid, 50)),
+]
+
+
+def seed(user_count, group_count, rng):
+    """
+    Insert a synthetic cohort sized like a busy campus: users with profiles and courses,
+    groups with members, courses and pending join requests, direct requests and peer scores.
+
+    """
+    session = db.session
+    now = datetime.utcnow()
+    uids = [f"qp{i:06d}" for i in range(user_count)]
+
+    course_ids = [f"QP{100 + i}" for i in range(COURSE_COUNT)]
+    session.execute(Course.__table__.insert(), [{"course_id": c, "title": f"Plan check {c}"} for c in course_ids])
+
+    session.execute(User.__table__.insert(), [
+        {"uid": uid, "username": f"qp_user_{i}", "email": f"qp_user_{i}@example.edu"}
+        for i, uid in enumerate(uids)
+    ])
+    session.execute(UserProfile.__table__.insert(), [
+        {
+            "uid": uid,
+            "date_of_birth": date(2000, 1, 1) + timedelta(days=rng.randrange(3000)),
+            "grade": rng.choice(list(Grade)),
+            "gender": rng.choice(list(Gender)),
+        }
+        for uid in uids
+    ])
+    enrollments = {uid: rng.sample(course_ids, rng.randint(3, 5)) for uid in uids}
+    session.execute(UserCourse.__table__.insert(), [
+        {"uid": uid, "course_id": course_id} for uid, courses in enrollments.items() for course_id in courses
+    ])
+
+    first_group_id = (session.execute(select(func.max(Group.id))).scalar() or 0) + 1000
+    group_ids = list(range(first_group_id, first_group_id + max(1, group_count)))
+    members = {group_id: rng.sample(uids, rng.randint(2, 9)) for group_id in group_ids}
+    session.execute(Group.__table__.insert(), [
+        {
+            "id": group_id,
+            "name": f"Plan check group {group_id}",
+            "is_visible": rng.random() < 0.8,
+            "privacy": rng.choice(list(GroupPrivacy)),
+            "member_count": len(members[group_id]),
+            "created_at": now - timedelta(minutes=group_id - first_group_id),
+            "updated_at": now,
+        }
+        for group_id in group_ids
+    ])
+    session.execute(GroupMember.__table__.insert(), [
+        {"group_id": group_id, "user_uid": uid, "role": GroupRole.ADMIN if position == 0 else GroupRole.MEMBER}
+        for group_id, group_members in members.items()
+        for position, uid in enumerate(group_members)
+    ])
+    session.execute(group_courses.insert(), [
+        {"group_id": group_id, "course_id": course_id}
+        for group_id in group_ids
+        for course_id in rng.sample(course_ids, rng.randint(1, 3))
+    ])
+    join_requests = {
+        (requester_uid, group_id)
+        for group_id in group_ids
+        for requester_uid in rng.sample(uids, 3)
+        if requester_uid not in members[group_id]
+    }
+    session.execute(GroupRequest.__table__.insert(), [
+        {"requester_uid": requester_uid, "group_id": group_id, "status": GroupRequestStatus.PENDING}
+        for requester_uid, group_id in join_requests
+    ])
+
+    session.execute(DirectRequest.__table__.insert(), [
+        {
+            "sender_uid": uid,
+            "receiver_uid": receiver_uid,
+            "status": rng.choice(list(RequestStatus)),
+            "created_at": now - timedelta(seconds=rng.randrange(10_000_000)),
+        }
+        for uid in uids
+        for receiver_uid in rng.sample(uids, 3)
+        if receiver_uid != uid
+    ])
+
+    session.execute(UserCompatibility.__table__.insert(), [
+        {
+            "uid_a": uid,
+            "uid_b": peer_uid,
+            "shared_course_count": rng.randint(1, 3),
+            "grade_match": rng.random() < 0.2,
+            "score": rng.randint(1, 4) + rng.random(),
+        }
+        for uid in uids
+        for peer_uid in rng.sample(uids, PEERS_PER_USER)
+        if peer_uid != uid
+    ])
+
+    session.execute(db.text("ANALYZE"))
+
+
+def pick_sample():
+    """
+    A busy user (most group memberships) plus one of their groups and courses.
+
+    """
+    uid = db.session.execute(
+        select(GroupMember.user_uid).group_by(GroupMember.user_uid).order_by(func.count().desc()).limit(1)
+    ).scalar()
+    group_id = db.session.execute(select(GroupMember.group_id).where(GroupMember.user_uid == uid).limit(1)).scalar()
+    course_id = db.session.execute(select(UserCourse.course_id).where(UserCourse.uid == uid).limit(1)).scalar()
+    if uid is None or course_id is None:
+        raise SystemExit("No group members or enrollments to sample from; run without --no-seed")
+    return SimpleNamespace(uid=uid, group_id=group_id, course_id=course_id)
+
+
+def table_sizes():
+    return {
+        table.name: db.session.execute(select(func.count()).select_from(table)).scalar()
+        for table in db.metadata.sorted_tables
+    }
+
+
+def seq_scans(plan):
+    if plan.get("Node Type") == "Seq Scan":
+        yield plan["Relation Name"]
+    for child in plan.get("Plans", ()):
+        yield from seq_scans(child)
+
+
+def run_checks(sample, min_rows, verbose):
+    sizes = table_sizes()
+    large = {name for name, rows in sizes.items() if rows >= min_rows}
+    print("Tables at or above --min-rows: " + (", ".join(f"{name} ({sizes[name]:,})" for name in sorted(large)) or "none"))
+
+    captured = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(db.engine, "before_cursor_execute", capture)
+    failures = 0
+    try:
+        for name, call in CHECKS:
+            GroupRepo._invalidate_role(sample.group_id, sample.uid)
+            captured.clear()
+            call(sample)
+            statements = list(captured)
+            captured.clear()
+
+            problems = []
+            for statement, parameters in statements:
+                plan = db.session.connection().exec_driver_sql(
+                    "EXPLAIN (FORMAT JSON) " + statement, parameters
+                ).scalar()[0]["Plan"]
+                scanned = sorted(set(seq_scans(plan)) & large)
+                if scanned:
+                    problems.append((scanned, statement))
+                if verbose:
+                    print(f"    {plan['Node Type']} (cost {plan['Total Cost']}): {' '.join(statement.split())[:120]}")
+
+            if problems:
+                failures += 1
+                print(f"FAIL {name}")
+                for scanned, statement in problems:
+                    print(f"     Seq Scan on {', '.join(scanned)}: {' '.join(statement.split())[:200]}")
+            else:
+                print(f"ok   {name} ({len(statements)} statement{'s' if len(statements) != 1 else ''})")
+    finally:
+        event.remove(db.engine, "before_cursor_execute", capture)
+
+    print(f"{len(CHECKS) - failures}/{len(CHECKS)} checks passed")
+    return failures
+
+
+def main(users, min_rows, no_seed, verbose, groups=None):
+    app = create_app()
+    with app.app_context():
+        if db.engine.dialect.name != "postgresql":
+            print(f"DATABASE_URL must point at PostgreSQL (got {db.engine.dialect.name})")
+            return 2
+
+        # Everything below runs in one outer transaction that is always rolled back
+        db.session.remove()
+        app_session = db.session
+        connection = db.engine.connect()
+        outer = connection.begin()
+        db.session = scoped_session(
+            sessionmaker(bind=connection, join_transaction_mode="create_savepoint", autoflush=False)
+        )
+        try:
+            if not no_seed:
+                seed(users, users // 2 if groups is None else groups, random.Random(7))
+            return 1 if run_checks(pick_sample(), min_rows, verbose) else 0
+        finally:
+            db.session.remove()
+            db.session = app_session
+            outer.rollback()
+            connection.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="EXPLAIN the repository read paths and fail on large sequential scans")
+    parser.add_argument("--users", type=int, default=20000, help="synthetic users to seed")
+    parser.add_argument("--groups", type=int, default=None, help="synthetic groups to seed (default users / 2)")
+    parser.add_argument("--min-rows", type=int, default=5000, help="tables smaller than this may be scanned")
+    parser.add_argument("--no-seed", action="store_true", help="check against existing data only")
+    parser.add_argument("--verbose", action="store_true", help="print the top plan node of every statement")
+    args = parser.parse_args()
+    sys.exit(main(args.users, args.min_rows, args.no_seed, args.verbose, args.groups))
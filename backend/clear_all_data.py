@@ -9,6 +9,7 @@ from app import create_app, db
 from app.models.user import User, UserProfile, UserCourse, Course
 from app.models.group import Group, GroupMember, group_courses
 from app.models.direct_request import DirectRequest
+from app.models.compatibility import UserCompatibility
 from app.models.group_request import GroupRequest
 
 # Course data to seed
@@ -67,19 +68,23 @@ def clear_all_data_and_reseed():
             print("   - Deleting groups...")
             Group.query.delete()
             
-            # 6. Delete user-course enrollments (references users and courses)
+            # 6. Delete precomputed People Feed pairs (references users)
+            print("   - Deleting user compatibility pairs...")
+            UserCompatibility.query.delete()
+            
+            # 7. Delete user-course enrollments (references users and courses)
             print("   - Deleting user course enrollments...")
             UserCourse.query.delete()
             
-            # 7. Delete user profiles (references users)
+            # 8. Delete user profiles (references users)
             print("   - Deleting user profiles...")
             UserProfile.query.delete()
             
-            # 8. Delete users
+            # 9. Delete users
             print("   - Deleting users...")
             User.query.delete()
             
-            # 9. Delete courses
+            # 10. Delete courses
             print("   - Deleting courses...")
             Course.query.delete()
             
@@ -0,0 +1,48 @@
+"""add_user_compatibility_table
+
+Revision ID: 3f9c2d7a1b64
+Revises: bb24e514dbe7
+Create Date: 2026-10-17 10:12:41.208311
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3f9c2d7a1b64'
+down_revision = 'bb24e514dbe7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Precomputed People Feed pairs (one row per direction)
+    op.create_table('user_compatibility',
+    sa.Column('uid_a', sa.String(), nullable=False),
+    sa.Column('uid_b', sa.String(), nullable=False),
+    sa.Column('shared_course_count', sa.Integer(), nullable=False),
+    sa.Column('grade_match', sa.Boolean(), nullable=False),
+    sa.Column('score', sa.Float(), nullable=False),
+    sa.ForeignKeyConstraint(['uid_a'], ['users.uid'], ),
+    sa.ForeignKeyConstraint(['uid_b'], ['users.uid'], ),
+    sa.PrimaryKeyConstraint('uid_a', 'uid_b')
+    )
+    op.create_index('ix_user_compatibility_uid_a_score', 'user_compatibility', ['uid_a', 'score'], unique=False)
+
+    # Backfill from existing enrollments (same statement as CompatibilityRepo.rebuild)
+    op.execute("""
+        INSERT INTO user_compatibility (uid_a, uid_b, shared_course_count, grade_match, score)
+        SELECT a.uid, b.uid, COUNT(*), pa.grade = pb.grade,
+               COUNT(*) * 1.0 + CASE WHEN pa.grade = pb.grade THEN 1.0 ELSE 0.0 END
+        FROM user_courses a
+        JOIN user_courses b ON a.course_id = b.course_id AND a.uid <> b.uid
+        JOIN user_profiles pa ON pa.uid = a.uid
+        JOIN user_profiles pb ON pb.uid = b.uid
+        GROUP BY a.uid, b.uid, pa.grade, pb.grade
+    """)
+
+
+def downgrade():
+    op.drop_index('ix_user_compatibility_uid_a_score', table_name='user_compatibility')
+    op.drop_table('user_compatibility')
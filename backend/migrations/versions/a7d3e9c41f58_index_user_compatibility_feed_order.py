@@ -0,0 +1,33 @@
+"""index_user_compatibility_feed_order
+
+Revision ID: a7d3e9c41f58
+Revises: f2c8a4e61b97
+Create Date: 2026-10-17 21:42:18.305127
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a7d3e9c41f58'
+down_revision = 'f2c8a4e61b97'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # People Feed pages are ordered by (score desc, uid_b) within one uid_a; the index now
+    # carries the tie-breaker so each page is a range scan without a sort
+    op.drop_index('ix_user_compatibility_uid_a_score', table_name='user_compatibility')
+    op.create_index(
+        'ix_user_compatibility_uid_a_score_uid_b',
+        'user_compatibility',
+        ['uid_a', sa.text('score DESC'), 'uid_b'],
+        unique=False
+    )
+
+
+def downgrade():
+    op.drop_index('ix_user_compatibility_uid_a_score_uid_b', table_name='user_compatibility')
+    op.create_index('ix_user_compatibility_uid_a_score', 'user_compatibility', ['uid_a', 'score'], unique=False)
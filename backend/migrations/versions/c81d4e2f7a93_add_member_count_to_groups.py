@@ -0,0 +1,32 @@
+"""add_member_count_to_groups
+
+Revision ID: c81d4e2f7a93
+Revises: 3f9c2d7a1b64
+Create Date: 2026-10-17 14:05:12.447190
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'c81d4e2f7a93'
+down_revision = '3f9c2d7a1b64'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('groups', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('member_count', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill from existing memberships
+    op.execute("""
+        UPDATE groups
+        SET member_count = (SELECT COUNT(*) FROM group_members WHERE group_members.group_id = groups.id)
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('groups', schema=None) as batch_op:
+        batch_op.drop_column('member_count')
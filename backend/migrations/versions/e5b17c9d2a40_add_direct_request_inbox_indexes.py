@@ -0,0 +1,31 @@
+"""add_direct_request_inbox_indexes
+
+Revision ID: e5b17c9d2a40
+Revises: c81d4e2f7a93
+Create Date: 2026-10-17 16:42:08.913527
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e5b17c9d2a40'
+down_revision = 'c81d4e2f7a93'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Keyset-paginated inbox pages: owner [+ status] then (created_at, id)
+    op.create_index('ix_direct_requests_receiver_created', 'direct_requests', ['receiver_uid', 'created_at', 'id'], unique=False)
+    op.create_index('ix_direct_requests_receiver_status_created', 'direct_requests', ['receiver_uid', 'status', 'created_at', 'id'], unique=False)
+    op.create_index('ix_direct_requests_sender_created', 'direct_requests', ['sender_uid', 'created_at', 'id'], unique=False)
+    op.create_index('ix_direct_requests_sender_status_created', 'direct_requests', ['sender_uid', 'status', 'created_at', 'id'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_direct_requests_sender_status_created', table_name='direct_requests')
+    op.drop_index('ix_direct_requests_sender_created', table_name='direct_requests')
+    op.drop_index('ix_direct_requests_receiver_status_created', table_name='direct_requests')
+    op.drop_index('ix_direct_requests_receiver_created', table_name='direct_requests')
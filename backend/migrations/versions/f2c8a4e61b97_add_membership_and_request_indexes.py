@@ -0,0 +1,40 @@
+"""add_membership_and_request_indexes
+
+Revision ID: f2c8a4e61b97
+Revises: e5b17c9d2a40
+Create Date: 2026-10-17 18:20:37.604115
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'f2c8a4e61b97'
+down_revision = 'e5b17c9d2a40'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # group_courses lost its indexes in bb24e514dbe7; the (group_id, course_id) primary key
+    # covers lookups by group, so only the course side needs one
+    op.create_index('ix_group_courses_course_id', 'group_courses', ['course_id', 'group_id'], unique=False)
+
+    # unique_group_member (group_id, user_uid) covers lookups by group
+    op.create_index('ix_group_members_user_uid', 'group_members', ['user_uid', 'group_id'], unique=False)
+
+    # Pending join requests per group (admin view) and per requester, newest first
+    op.create_index('ix_group_requests_group_status_created', 'group_requests', ['group_id', 'status', 'created_at'], unique=False)
+    op.create_index('ix_group_requests_requester_status_created', 'group_requests', ['requester_uid', 'status', 'created_at'], unique=False)
+
+    # The (uid, course_id) primary key covers lookups by user; classmates are looked up by course
+    op.create_index('ix_user_courses_course_id', 'user_courses', ['course_id', 'uid'], unique=False)
+
+
+def downgrade():
+    op.drop_index('ix_user_courses_course_id', table_name='user_courses')
+    op.drop_index('ix_group_requests_requester_status_created', table_name='group_requests')
+    op.drop_index('ix_group_requests_group_status_created', table_name='group_requests')
+    op.drop_index('ix_group_members_user_uid', table_name='group_members')
+    op.drop_index('ix_group_courses_course_id', table_name='group_courses')
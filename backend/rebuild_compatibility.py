@@ -0,0 +1,27 @@
+"""
+Repair command for the precomputed People Feed pairs.
+Rebuilds the user_compatibility table from scratch out of user_courses + user_profiles.
+Use after bulk imports or if incremental maintenance is suspected to have drifted.
+"""
+
+from app import create_app
+from app.models.compatibility import UserCompatibility
+from app.repositories.compatibility_repo import CompatibilityRepo
+
+
+def rebuild_compatibility():
+    """Drop and recompute every compatibility pair."""
+
+    app = create_app()
+
+    with app.app_context():
+        before = UserCompatibility.query.count()
+        print(f"Rebuilding user compatibility pairs ({before} rows before)...")
+
+        after = CompatibilityRepo.rebuild()
+
+        print(f"Rebuilt user compatibility pairs: {after} rows")
+
+
+if __name__ == "__main__":
+    rebuild_compatibility()
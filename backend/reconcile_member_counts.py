@@ -0,0 +1,24 @@
+"""
+Repair command for the denormalized groups.member_count column.
+Recounts group_members for every group and fixes the groups whose counter drifted.
+"""
+
+from app import create_app
+from app.repositories.group_repo import GroupRepo
+
+
+def reconcile_member_counts():
+    """Recount members for every group."""
+
+    app = create_app()
+
+    with app.app_context():
+        print("Reconciling group member counts...")
+
+        corrected = GroupRepo.reconcile_member_counts()
+
+        print(f"Corrected member_count on {corrected} group(s)")
+
+
+if __name__ == "__main__":
+    reconcile_member_counts()
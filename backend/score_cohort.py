@@ -0,0 +1,58 @@
+"""
+Batch compatibility scoring for the whole cohort (analytics / precomputation).
+Scores every pair of students sharing at least one course with the vectorized kernel
+in app/utils/compatibility_kernel.py and prints a summary.
+
+Usage: python score_cohort.py [--block-size 2048] [--processes N]
+"""
+
+import argparse
+import time
+from collections import Counter, defaultdict
+
+import numpy as np
+
+from app import create_app, db
+from app.models.user import UserProfile, UserCourse
+from app.utils.compatibility_kernel import encode_cohort, iter_pair_blocks, scores
+
+
+def load_cohort_rows():
+    """Return (uid, grade value, [course_id, ...]) for every user with a profile."""
+    courses_by_uid = defaultdict(list)
+    for uid, course_id in db.session.query(UserCourse.uid, UserCourse.course_id).all():
+        courses_by_uid[uid].append(course_id)
+
+    return [
+        (uid, grade.value, courses_by_uid.get(uid, []))
+        for uid, grade in db.session.query(UserProfile.uid, UserProfile.grade).all()
+    ]
+
+
+def score_cohort(block_size, processes):
+    app = create_app()
+    with app.app_context():
+        started = time.perf_counter()
+        cohort = encode_cohort(load_cohort_rows())
+        loaded = time.perf_counter()
+        print(f"Encoded {len(cohort)} users across {len(cohort.course_ids)} courses in {loaded - started:.2f}s")
+
+        pair_count = 0
+        histogram = Counter()
+        for _, _, counts, grade_match in iter_pair_blocks(cohort, block_size=block_size, processes=processes):
+            pair_count += len(counts)
+            values, frequencies = np.unique(scores(counts, grade_match), return_counts=True)
+            histogram.update(dict(zip(values.tolist(), frequencies.tolist())))
+
+        finished = time.perf_counter()
+        print(f"Scored {pair_count} compatible pairs in {finished - loaded:.2f}s")
+        for score in sorted(histogram, reverse=True):
+            print(f"  - score {score:g}: {histogram[score]} pairs")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Score every compatible pair of students")
+    parser.add_argument("--block-size", type=int, default=2048)
+    parser.add_argument("--processes", type=int, default=None, help="defaults to the CPU count")
+    args = parser.parse_args()
+    score_cohort(args.block_size, args.processes)
@@ -1,5 +1,5 @@
-from app import create_app, db
-from app.models.user import Course
+from app import create_app
+from app.repositories.course_repo import CourseRepo
 # These are temporarily the list of all courses available in the system
 COURSES = [
     ("CSE1001", "Intro to Programming"),
@@ -12,11 +12,9 @@ COURSES = [
 def seed():
     app = create_app()
     with app.app_context():
-        for course_id, title in COURSES:
-            # Safe merge inserts or updates existing
-            db.session.merge(Course(course_id=course_id, title=title))
-        db.session.commit()
-        print(f"Seeded {len(COURSES)} courses.")
+        # Inserts or updates existing; running workers serve the new catalog once their snapshot expires (COURSE_CATALOG_TTL)
+        count = CourseRepo.upsert_courses(COURSES)
+        print(f"Seeded {count} courses.")
 
 if __name__ == "__main__":
     seed()
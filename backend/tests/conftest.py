@@ -0,0 +1,48 @@
+"""
+Shared pytest fixtures: the Flask app on an in-memory SQLite database, plus a
+statement counter for query-count assertions.
+"""
+
+import os
+import sys
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import event
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, BACKEND_DIR)
+
+# Must be set before app import; load_dotenv() does not override existing variables
+os.environ["DATABASE_URL"] = os.getenv("TEST_DATABASE_URL", "sqlite://")
+os.environ.setdefault("FIREBASE_SERVICE_ACCOUNT_PATH", os.path.join(BACKEND_DIR, "serviceAccountKey.json"))
+
+from app import create_app, db  # noqa: E402
+
+
+@pytest.fixture
+def app():
+    app = create_app()
+    with app.app_context():
+        db.create_all()
+        yield app
+        db.session.remove()
+        db.drop_all()
+
+
+@contextmanager
+def count_queries():
+    """
+    Collect the SQL statements executed inside the block: `with count_queries() as statements:`.
+
+    """
+    statements = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(db.engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(db.engine, "before_cursor_execute", record)
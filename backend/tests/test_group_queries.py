@@ -0,0 +1,43 @@
+"""
+Query-count regression tests for GroupRepo read paths.
+"""
+
+import pytest
+
+from app import db
+from app.models.user import Course
+from app.repositories.group_repo import GroupRepo
+from conftest import count_queries
+
+COURSES = ["CSE1001", "CSE2010", "MTH2001"]
+
+
+def seed_groups(member_uid, group_count):
+    db.session.add_all([Course(course_id=course_id, title=course_id) for course_id in COURSES])
+    db.session.commit()
+    for i in range(group_count):
+        group = GroupRepo.create_group(f"Group {i}", f"admin{i}", course_ids=COURSES[: 1 + i % len(COURSES)])
+        GroupRepo.add_member(group["id"], member_uid)
+    db.session.expire_all()
+
+
+@pytest.mark.parametrize("group_count", [1, 10, 50])
+def test_get_user_groups_statement_count_is_constant(app, group_count):
+    seed_groups("member", group_count)
+
+    with count_queries() as statements:
+        groups = GroupRepo.get_user_groups("member")
+
+    assert len(groups) == group_count
+    assert all(group["courses"] for group in groups)
+    # memberships + groups in one joined query, all their courses in one selectin query
+    assert len(statements) == 2, statements
+
+
+def test_get_user_groups_without_memberships_is_one_query(app):
+    seed_groups("member", 3)
+
+    with count_queries() as statements:
+        assert GroupRepo.get_user_groups("nobody") == []
+
+    assert len(statements) == 1, statements
@@ -0,0 +1,34 @@
+"""
+Runs check_query_plans.py under pytest against a PostgreSQL database.
+Skipped unless TEST_POSTGRES_URL points at a database the test may migrate; the seeded
+cohort is rolled back at the end, so only the schema is left behind.
+"""
+
+import os
+
+import pytest
+
+import check_query_plans
+
+MIGRATIONS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "migrations")
+POSTGRES_URL = os.getenv("TEST_POSTGRES_URL")
+
+pytestmark = pytest.mark.skipif(not POSTGRES_URL, reason="TEST_POSTGRES_URL is not set")
+
+
+def test_read_paths_do_not_seq_scan_large_tables(monkeypatch, capsys):
+    monkeypatch.setenv("DATABASE_URL", POSTGRES_URL)
+
+    from flask_migrate import upgrade
+    from app import create_app
+
+    with create_app().app_context():
+        upgrade(directory=MIGRATIONS_DIR)
+
+    status = check_query_plans.main(users=20000, min_rows=5000, no_seed=False, verbose=False)
+
+    report = capsys.readouterr().out
+    assert status == 0, report
+    # The seeded cohort must be large enough for the indexes under test to matter
+    for table in ("groups", "group_courses", "group_members", "user_courses", "direct_requests"):
+        assert f" {table} (" in report, report
@@ -0,0 +1,151 @@
+"""
+Offline ID token verification through a StaticKeySource-backed verifier installed with
+set_token_verifier: claim validation, unknown-kid refresh throttling and the shared token cache.
+"""
+
+import time
+
+import jwt
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+from app import firebase_auth
+from app.token_verifier import FirebaseTokenVerifier, InvalidTokenError, StaticKeySource
+
+PROJECT_ID = "studybuddy-test"
+ISSUER = f"https://securetoken.google.com/{PROJECT_ID}"
+
+
+def generate_key():
+    return rsa.generate_private_key(public_exponent=65537, key_size=2048)
+
+
+def public_pem(private_key):
+    return private_key.public_key().public_bytes(
+        serialization.Encoding.PEM, serialization.PublicFormat.SubjectPublicKeyInfo
+    )
+
+
+SIGNING_KEY = generate_key()
+
+
+def make_token(private_key=SIGNING_KEY, kid="key-1", **overrides):
+    now = int(time.time())
+    claims = {
+        "iss": ISSUER,
+        "aud": PROJECT_ID,
+        "sub": "user-1",
+        "iat": now - 10,
+        "exp": now + 3600,
+        "auth_time": now - 10,
+        "email": "user-1@example.com",
+    }
+    claims.update(overrides)
+    claims = {name: value for name, value in claims.items() if value is not None}
+    return jwt.encode(claims, private_key, algorithm="RS256", headers={"kid": kid})
+
+
+@pytest.fixture
+def verifier(monkeypatch):
+    monkeypatch.setattr(firebase_auth, "TOKEN_VERIFIER_MODE", "offline")
+    firebase_auth._token_cache.clear()
+    # Shares the process token cache, like the verifier get_token_verifier builds
+    verifier = FirebaseTokenVerifier(
+        PROJECT_ID,
+        key_source=StaticKeySource({"key-1": public_pem(SIGNING_KEY)}),
+        claims_cache=firebase_auth._token_cache,
+        forced_refresh_interval=60,
+    )
+    verifier.refresh_keys()
+    firebase_auth.set_token_verifier(verifier)
+    yield verifier
+    firebase_auth.set_token_verifier(None)
+    firebase_auth._token_cache.clear()
+
+
+def test_valid_token_is_cached_until_exp(verifier):
+    token = make_token()
+    before = firebase_auth.token_cache_stats()
+
+    claims = firebase_auth.verify_firebase_token(token)
+    assert claims["uid"] == "user-1"
+    assert claims["email"] == "user-1@example.com"
+    assert firebase_auth.verify_firebase_token(token) == claims
+
+    after = firebase_auth.token_cache_stats()
+    assert after["misses"] - before["misses"] == 1
+    assert after["hits"] - before["hits"] == 1
+    assert after["size"] == 1
+
+
+@pytest.mark.parametrize("overrides", [
+    {"exp": int(time.time()) - 60, "iat": int(time.time()) - 3700},
+    {"iat": int(time.time()) + 600},
+    {"auth_time": int(time.time()) + 600},
+], ids=["expired", "future-iat", "future-auth-time"])
+def test_rejects_bad_timestamps(verifier, overrides):
+    with pytest.raises(InvalidTokenError):
+        firebase_auth.verify_firebase_token(make_token(**overrides))
+
+
+@pytest.mark.parametrize("overrides", [
+    {"aud": "another-project"},
+    {"iss": "https://securetoken.google.com/another-project"},
+    {"iss": None},
+], ids=["wrong-aud", "wrong-iss", "missing-iss"])
+def test_rejects_foreign_audience_or_issuer(verifier, overrides):
+    with pytest.raises(InvalidTokenError):
+        firebase_auth.verify_firebase_token(make_token(**overrides))
+
+
+@pytest.mark.parametrize("sub", ["", "x" * 129, 42, None], ids=["empty", "too-long", "not-a-string", "missing"])
+def test_rejects_bad_subject(verifier, sub):
+    with pytest.raises(InvalidTokenError):
+        firebase_auth.verify_firebase_token(make_token(sub=sub))
+
+
+def test_rejects_token_signed_with_another_key(verifier):
+    with pytest.raises(InvalidTokenError):
+        firebase_auth.verify_firebase_token(make_token(private_key=generate_key()))
+
+
+def test_rejected_tokens_are_not_cached(verifier):
+    with pytest.raises(InvalidTokenError):
+        firebase_auth.verify_firebase_token(make_token(aud="another-project"))
+
+    assert firebase_auth.token_cache_stats()["size"] == 0
+
+
+def test_unknown_kid_refreshes_once_per_interval(verifier):
+    rotated_key = generate_key()
+    token = make_token(private_key=rotated_key, kid="key-2")
+
+    # The first unknown kid forces a refresh, which still does not know key-2
+    with pytest.raises(InvalidTokenError, match="unknown 'kid'"):
+        firebase_auth.verify_firebase_token(token)
+    assert verifier.stats()["key_refreshes"] == 2
+    assert verifier.stats()["forced_refreshes_throttled"] == 0
+
+    # Once the key is published, requests inside the cooldown are still rejected without a fetch
+    verifier.key_source.keys["key-2"] = rotated_key.public_key()
+    for _ in range(3):
+        with pytest.raises(InvalidTokenError, match="unknown 'kid'"):
+            firebase_auth.verify_firebase_token(token)
+    assert verifier.stats()["key_refreshes"] == 2
+    assert verifier.stats()["forced_refreshes_throttled"] == 3
+
+    # After the cooldown the next unknown kid refreshes and picks up the rotated key
+    verifier._last_forced_refresh -= verifier.forced_refresh_interval
+    assert firebase_auth.verify_firebase_token(token)["uid"] == "user-1"
+    assert verifier.stats()["key_refreshes"] == 3
+
+
+def test_authenticated_route_rejects_invalid_token(app, verifier):
+    client = app.test_client()
+
+    response = client.get("/api/users/me/", headers={"Authorization": f"Bearer {make_token(aud='another-project')}"})
+    assert response.status_code == 401
+
+    response = client.get("/api/users/me/", headers={"Authorization": f"Bearer {make_token()}"})
+    assert response.status_code != 401
@@ -21,6 +21,37 @@ export default function GroupFeedPage() {
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState("");
   const [lastRefresh, setLastRefresh] = useState(Date.now());
+  const [nextCursor, setNextCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
+
+  // Fetch one ranked page of the feed; the server returns next_cursor while more groups remain
+  const fetchFeedPage = useCallback(
+    async (cursor) => {
+      const token = await user.getIdToken();
+      const query = cursor ? `?cursor=${encodeURIComponent(cursor)}` : "";
+
+      const response = await fetch(
+        `http://localhost:5000/api/groups/feed/${query}`,
+        {
+          method: "GET",
+          headers: {
+            Authorization: "Bearer " + token,
+            "Content-Type": "application/json",
+          },
+        }
+      );
+
+      console.log("Response status:", response.status);
+
+      const data = await response.json();
+      if (!response.ok) {
+        console.error("API Error:", data);
+        throw new Error(data.error || "Failed to load group recommendations.");
+      }
+      return data;
+    },
+    [user]
+  );
 
   const loadGroupFeed = useCallback(async () => {
     if (!user) {
@@ -32,42 +63,43 @@ export default function GroupFeedPage() {
     try {
       setLoading(true);
       setError("");
-      const token = await user.getIdToken();
+      const data = await fetchFeedPage(null);
 
-      const response = await fetch(`http://localhost:5000/api/groups/feed/`, {
-        method: "GET",
-        headers: {
-          Authorization: "Bearer " + token,
-          "Content-Type": "application/json",
-        },
-      });
+      const userCourses = data.user_courses || [];
+      const groups = data.groups || [];
 
-      console.log("Response status:", response.status);
+      setUserCourses(userCourses);
+      setNextCursor(data.next_cursor || null);
 
-      if (response.ok) {
-        const data = await response.json();
+      // Use ranking engine to sort the groups
+      console.log("Ranking groups with user courses:", userCourses);
+      const rankedGroups = rankGroups(userCourses, groups);
+      setGroups(rankedGroups); //store ranked groups
+    } catch (err) {
+      console.error("Failed to load group feed:", err);
+      setError(err.message || "Failed to load group feed. Please try again.");
+    } finally {
+      setLoading(false);
+    }
+  }, [user, fetchFeedPage]);
 
-        const userCourses = data.user_courses || [];
-        const groups = data.groups || [];
+  const handleLoadMore = async () => {
+    if (!nextCursor || loadingMore) return;
 
-        setUserCourses(userCourses);
+    try {
+      setLoadingMore(true);
+      const data = await fetchFeedPage(nextCursor);
 
-        // Use ranking engine to sort the groups
-        console.log("Ranking groups with user courses:", userCourses);
-        const rankedGroups = rankGroups(userCourses, groups);
-        setGroups(rankedGroups); //store ranked groups
-      } else {
-        const errorData = await response.json();
-        console.error("API Error:", errorData);
-        setError(errorData.error || "Failed to load group recommendations.");
-      }
+      // Pages arrive in ranked order, so appending and re-ranking keeps the list stable
+      setGroups((prev) => rankGroups(userCourses, [...prev, ...(data.groups || [])]));
+      setNextCursor(data.next_cursor || null);
     } catch (err) {
-      console.error("Failed to load group feed:", err);
-      setError("Failed to load group feed. Please try again.");
+      console.error("Failed to load more groups:", err);
+      alert("Failed to load more groups. Please try again.");
     } finally {
-      setLoading(false);
+      setLoadingMore(false);
     }
-  }, [user]);
+  };
 
   const handleRefresh = () => {
     setLastRefresh(Date.now());
@@ -284,6 +316,15 @@ export default function GroupFeedPage() {
               </div>
             </div>
           ))}
+          {nextCursor && (
+            <button
+              className="group-feed-load-more-button"
+              onClick={handleLoadMore}
+              disabled={loadingMore}
+            >
+              {loadingMore ? "Loading..." : "Load More Groups"}
+            </button>
+          )}
         </div>
       )}
     </div>
@@ -7,16 +7,30 @@
 import { useEffect, useState } from "react";
 import { useAuth } from "../auth/AuthProvider";
 import ProfileCard from "../components/ProfileCard";
-import { rankUsers } from "../utils/peopleRankingEngine";
+import { calculateAge } from "../utils/peopleRankingEngine";
+import { fetchRequestsWith, MAX_UIDS_PER_QUERY } from "../utils/requestPages";
 import LoadingSpinner from "../components/LoadingSpinner";
 import "./PeopleFeed.css";
 
+// Ranked feed page size; the server ranks (score, then uid) and pages with next_cursor
+const FEED_PAGE_SIZE = 20;
+
+// Shape a server-ranked feed user for ProfileCard
+const toProfileCardUser = (feedUser) => ({
+  ...feedUser,
+  compatibilityScore: feedUser.compatibility_score,
+  sharedCourses: feedUser.shared_courses || [],
+  age: calculateAge(feedUser.date_of_birth),
+});
+
 export default function PeopleFeed() {
   const { user } = useAuth();
 
   const [currentUserProfile, setCurrentUserProfile] = useState(null);
-  const [allUsers, setAllUsers] = useState([]);
   const [rankedUsers, setRankedUsers] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
+  const [totalUsers, setTotalUsers] = useState(0);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState("");
   const [requestStates, setRequestStates] = useState({});
@@ -68,29 +82,12 @@ export default function PeopleFeed() {
         const currentUserProfile = await currentUserRes.json();
         setCurrentUserProfile(currentUserProfile);
 
-        // Load all other users
-        const allUsersRes = await fetch(
-          "http://localhost:5000/api/users/all/",
-          {
-            headers: {
-              Authorization: "Bearer " + token,
-            },
-          }
-        );
-
-        if (!allUsersRes.ok) {
-          const allUsersData = await allUsersRes.json();
-          setError(allUsersData.error || "Failed to load users.");
-          setLoading(false);
-          return;
-        }
-
-        const allUsersData = await allUsersRes.json();
-        setAllUsers(allUsersData.users || []);
-
-        // Rank the users based on compatibility with current user
-        const ranked = rankUsers(currentUserProfile, allUsersData.users || []);
+        // Load the first ranked page of study buddies
+        const feedData = await fetchFeedPage(token, null);
+        const ranked = (feedData.users || []).map(toProfileCardUser);
         setRankedUsers(ranked);
+        setNextCursor(feedData.next_cursor || null);
+        setTotalUsers(feedData.total ?? ranked.length);
 
         // Load existing request states
         await loadRequestStates(token, ranked);
@@ -105,33 +102,81 @@ export default function PeopleFeed() {
     loadData();
   }, [user]);
 
-  // Load existing request states for the ranked users
+  // Fetch one ranked page of the People Feed (total is only sent with the first page)
+  const fetchFeedPage = async (token, cursor) => {
+    let url = `http://localhost:5000/api/users/feed/?limit=${FEED_PAGE_SIZE}`;
+    if (cursor) url += `&cursor=${encodeURIComponent(cursor)}`;
+
+    const res = await fetch(url, {
+      headers: {
+        Authorization: "Bearer " + token,
+      },
+    });
+
+    const data = await res.json();
+    if (!res.ok) {
+      throw new Error(data.error || "Failed to load users.");
+    }
+    return data;
+  };
+
+  const handleLoadMore = async () => {
+    if (!user || !nextCursor || loadingMore) return;
+
+    try {
+      setLoadingMore(true);
+      const token = await user.getIdToken();
+      const feedData = await fetchFeedPage(token, nextCursor);
+      const page = (feedData.users || []).map(toProfileCardUser);
+
+      // Pages arrive in ranked order, so the next page is appended as is
+      setRankedUsers((prev) => [...prev, ...page]);
+      setNextCursor(feedData.next_cursor || null);
+      await loadRequestStates(token, page);
+    } catch (err) {
+      console.error("Failed to load more users:", err);
+      alert("Failed to load more study buddies. Please try again.");
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  // Load existing request states for the given feed users, in batches the server accepts
   const loadRequestStates = async (token, users) => {
+    const uids = users.map((feedUser) => feedUser.uid);
+    for (let i = 0; i < uids.length; i += MAX_UIDS_PER_QUERY) {
+      await loadRequestStatesBatch(token, uids.slice(i, i + MAX_UIDS_PER_QUERY));
+    }
+  };
+
+  // Only the requests exchanged with these users are fetched (?uids=), not whole inboxes
+  const loadRequestStatesBatch = async (token, uids) => {
     try {
-      // Get outgoing requests to see who user already sent requests to
-      const outgoingRes = await fetch(
+      const uidsParam = encodeURIComponent(uids.join(","));
+
+      // Outgoing requests to these users, newest first, so the first one per user wins
+      const outgoing = await fetchRequestsWith(
         "http://localhost:5000/api/requests/outgoing/",
-        {
-          headers: {
-            Authorization: "Bearer " + token,
-          },
-        }
+        token,
+        uids
       );
 
-      if (outgoingRes.ok) {
-        const outgoingData = await outgoingRes.json();
-        const states = {};
-
-        outgoingData.requests?.forEach((request) => {
-          states[request.receiver_uid] = request.status;
-        });
+      // Pending incoming requests from these users that user needs to respond to
+      const incomingPending = await fetchRequestsWith(
+        "http://localhost:5000/api/requests/incoming/?status=pending",
+        token,
+        uids
+      );
 
-        setRequestStates(states);
-      }
+      const incomingAccepted = await fetchRequestsWith(
+        "http://localhost:5000/api/requests/incoming/?status=accepted",
+        token,
+        uids
+      );
 
-      // Get pending incoming requests to see who has sent requests to user that user need to respond to
-      const incomingPendingRes = await fetch(
-        "http://localhost:5000/api/requests/incoming/?status=pending",
+      // Which of these users still share a group with user, to validate "accepted" statuses
+      const sharedMembershipsRes = await fetch(
+        `http://localhost:5000/api/groups/shared-memberships/?uids=${uidsParam}`,
         {
           headers: {
             Authorization: "Bearer " + token,
@@ -139,70 +184,53 @@ export default function PeopleFeed() {
         }
       );
 
-      if (incomingPendingRes.ok) {
-        const incomingPendingData = await incomingPendingRes.json();
-        const incoming = {};
+      if (outgoing && incomingAccepted) {
+        const states = {};
 
-        incomingPendingData.requests?.forEach((request) => {
-          incoming[request.sender_uid] = request.id;
+        outgoing.forEach((request) => {
+          if (!(request.receiver_uid in states)) {
+            states[request.receiver_uid] = request.status;
+          }
         });
 
-        setIncomingRequests(incoming);
-      }
+        // Users who sent us requests that we accepted
+        incomingAccepted.forEach((request) => {
+          states[request.sender_uid] = "accepted";
+        });
 
-      const incomingAcceptedRes = await fetch(
-        "http://localhost:5000/api/requests/incoming/?status=accepted",
-        {
-          headers: {
-            Authorization: "Bearer " + token,
-          },
-        }
-      );
+        // Only keep "accepted" status if still in groups together
+        if (sharedMembershipsRes.ok) {
+          const sharedMembershipsData = await sharedMembershipsRes.json();
+          const usersInGroupsWith = new Set(
+            sharedMembershipsData.shared_memberships || []
+          );
 
-      if (incomingAcceptedRes.ok) {
-        const incomingAcceptedData = await incomingAcceptedRes.json();
+          Object.keys(states).forEach((userUid) => {
+            if (states[userUid] === "accepted" && !usersInGroupsWith.has(userUid)) {
+              delete states[userUid]; // Remove the status entirely
+            }
+          });
+        }
 
-        // Update request states for users who sent us requests that we accepted
+        // Replace the states of this batch only; other loaded users keep theirs
         setRequestStates((prev) => {
           const newStates = { ...prev };
-          incomingAcceptedData.requests?.forEach((request) => {
-            newStates[request.sender_uid] = "accepted";
-          });
-          return newStates;
+          uids.forEach((userUid) => delete newStates[userUid]);
+          return { ...newStates, ...states };
         });
       }
 
-      // Get shared group memberships to validate "accepted" statuses
-      const sharedMembershipsRes = await fetch(
-        "http://localhost:5000/api/groups/shared-memberships/",
-        {
-          headers: {
-            Authorization: "Bearer " + token,
-          },
-        }
-      );
-
-      if (sharedMembershipsRes.ok) {
-        const sharedMembershipsData = await sharedMembershipsRes.json();
-        const usersInGroupsWith = new Set(
-          sharedMembershipsData.shared_memberships || []
-        );
-
-        // Update request states: only keep "accepted" status if still in groups together
-        setRequestStates((prev) => {
-          const newStates = { ...prev };
+      if (incomingPending) {
+        const incoming = {};
 
-          // For each user with "accepted" status, check if still in groups together
-          Object.keys(newStates).forEach((userUid) => {
-            if (newStates[userUid] === "accepted") {
-              // If user no longer in any groups together, reset to null
-              if (!usersInGroupsWith.has(userUid)) {
-                delete newStates[userUid]; // Remove the status entirely
-              }
-            }
-          });
+        incomingPending.forEach((request) => {
+          incoming[request.sender_uid] = request.id;
+        });
 
-          return newStates;
+        setIncomingRequests((prev) => {
+          const newState = { ...prev };
+          uids.forEach((userUid) => delete newState[userUid]);
+          return { ...newState, ...incoming };
         });
       }
     } catch (err) {
@@ -457,8 +485,8 @@ export default function PeopleFeed() {
         <>
           <div className="people-feed-results-info">
             <p>
-              Found <strong>{rankedUsers.length}</strong> study buddy
-              {rankedUsers.length !== 1 ? "s" : ""}
+              Found <strong>{totalUsers}</strong> study buddy
+              {totalUsers !== 1 ? "s" : ""}
               who share courses with you
             </p>
           </div>
@@ -478,6 +506,16 @@ export default function PeopleFeed() {
               />
             ))}
           </div>
+
+          {nextCursor && (
+            <button
+              className="people-feed-load-more-button"
+              onClick={handleLoadMore}
+              disabled={loadingMore}
+            >
+              {loadingMore ? "Loading..." : "Load More Study Buddies"}
+            </button>
+          )}
         </>
       )}
 
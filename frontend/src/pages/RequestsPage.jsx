@@ -3,13 +3,16 @@
 import { useEffect, useState } from "react";
 import { useAuth } from "../auth/AuthProvider";
 import LoadingSpinner from "../components/LoadingSpinner";
+import { fetchRequestPage, mergeFirstPage } from "../utils/requestPages";
 import "./RequestsPage.css";
 
 export default function RequestsPage() {
   const { user } = useAuth();
 
-  const [incomingRequests, setIncomingRequests] = useState([]);
-  const [outgoingRequests, setOutgoingRequests] = useState([]);
+  // Each list holds the pages loaded so far and the cursor of the next one
+  const [incoming, setIncoming] = useState({ requests: [], nextCursor: null });
+  const [outgoing, setOutgoing] = useState({ requests: [], nextCursor: null });
+  const [loadingMore, setLoadingMore] = useState({});
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState("");
   const [loadingActions, setLoadingActions] = useState({});
@@ -42,34 +45,22 @@ export default function RequestsPage() {
     try {
       const token = await user.getIdToken();
 
-      // Load incoming requests (all statuses)
-      const incomingRes = await fetch(
+      // Reload the newest page of incoming requests (all statuses); older pages stay loaded
+      const incomingPage = await fetchRequestPage(
         "http://localhost:5000/api/requests/incoming/",
-        {
-          headers: {
-            Authorization: "Bearer " + token,
-          },
-        }
+        token
       );
-
-      if (incomingRes.ok) {
-        const incomingData = await incomingRes.json();
-        setIncomingRequests(incomingData.requests || []);
+      if (incomingPage) {
+        setIncoming((prev) => mergeFirstPage(prev, incomingPage));
       }
 
-      // Load outgoing requests (all statuses)
-      const outgoingRes = await fetch(
+      // Same for outgoing requests
+      const outgoingPage = await fetchRequestPage(
         "http://localhost:5000/api/requests/outgoing/",
-        {
-          headers: {
-            Authorization: "Bearer " + token,
-          },
-        }
+        token
       );
-
-      if (outgoingRes.ok) {
-        const outgoingData = await outgoingRes.json();
-        setOutgoingRequests(outgoingData.requests || []);
+      if (outgoingPage) {
+        setOutgoing((prev) => mergeFirstPage(prev, outgoingPage));
       }
 
       setError("");
@@ -81,6 +72,38 @@ export default function RequestsPage() {
     }
   };
 
+  // Fetch the next page of one list on demand
+  const handleLoadMore = async (direction) => {
+    const list = direction === "incoming" ? incoming : outgoing;
+    const setList = direction === "incoming" ? setIncoming : setOutgoing;
+    if (!user || !list.nextCursor || loadingMore[direction]) return;
+
+    setLoadingMore((prev) => ({ ...prev, [direction]: true }));
+
+    try {
+      const token = await user.getIdToken();
+      const page = await fetchRequestPage(
+        `http://localhost:5000/api/requests/${direction}/`,
+        token,
+        list.nextCursor
+      );
+
+      if (page) {
+        setList((prev) => ({
+          requests: [...prev.requests, ...page.requests],
+          nextCursor: page.next_cursor,
+        }));
+      } else {
+        alert("Failed to load more requests. Please try again.");
+      }
+    } catch (err) {
+      console.error("Failed to load more requests:", err);
+      alert("Failed to load more requests. Please try again.");
+    } finally {
+      setLoadingMore((prev) => ({ ...prev, [direction]: false }));
+    }
+  };
+
   const handleAcceptRequest = async (requestId) => {
     if (!user || !requestId) return;
 
@@ -235,8 +258,8 @@ export default function RequestsPage() {
     );
   }
 
-  const sortedIncoming = sortRequests(incomingRequests);
-  const sortedOutgoing = sortRequests(outgoingRequests);
+  const sortedIncoming = sortRequests(incoming.requests);
+  const sortedOutgoing = sortRequests(outgoing.requests);
 
   return (
     <div className="requests-page-container">
@@ -250,7 +273,8 @@ export default function RequestsPage() {
       {/* Incoming Requests Section */}
       <section className="requests-page-section">
         <h2 className="requests-page-section-title">
-          Incoming Requests ({incomingRequests.length})
+          Incoming Requests ({incoming.requests.length}
+          {incoming.nextCursor ? "+" : ""})
         </h2>
         <p className="requests-page-section-subtitle">
           Requests from other students who want to study with you
@@ -319,12 +343,22 @@ export default function RequestsPage() {
             ))}
           </div>
         )}
+        {incoming.nextCursor && (
+          <button
+            className="requests-page-load-more-button"
+            onClick={() => handleLoadMore("incoming")}
+            disabled={loadingMore.incoming}
+          >
+            {loadingMore.incoming ? "Loading..." : "Load More"}
+          </button>
+        )}
       </section>
 
       {/* Outgoing Requests Section */}
       <section className="requests-page-section">
         <h2 className="requests-page-section-title">
-          Outgoing Requests ({outgoingRequests.length})
+          Outgoing Requests ({outgoing.requests.length}
+          {outgoing.nextCursor ? "+" : ""})
         </h2>
         <p className="requests-page-section-subtitle">
           Requests you've sent to other students
@@ -384,6 +418,15 @@ export default function RequestsPage() {
             ))}
           </div>
         )}
+        {outgoing.nextCursor && (
+          <button
+            className="requests-page-load-more-button"
+            onClick={() => handleLoadMore("outgoing")}
+            disabled={loadingMore.outgoing}
+          >
+            {loadingMore.outgoing ? "Loading..." : "Load More"}
+          </button>
+        )}
       </section>
     </div>
   );
@@ -0,0 +1,69 @@
+/**
+ * Direct request inbox helpers
+ *
+ * The incoming/outgoing request endpoints are keyset-paginated: each response has
+ * "requests" (newest first) and a "next_cursor" that is null on the last page.
+ * Lists are loaded a page at a time; views that only care about a few users
+ * (e.g. one People Feed page) narrow the query with ?uids= instead.
+ */
+export const REQUEST_PAGE_SIZE = 50;
+
+// Most uids one narrowed query accepts (MAX_UIDS in backend/app/utils/query_params.py)
+export const MAX_UIDS_PER_QUERY = 100;
+
+const withParam = (url, name, value) =>
+  `${url}${url.includes("?") ? "&" : "?"}${name}=${encodeURIComponent(value)}`;
+
+// Fetch one page of a request list. Returns { requests, next_cursor } or null on failure.
+export async function fetchRequestPage(url, token, cursor = null, limit = REQUEST_PAGE_SIZE) {
+  let pageUrl = withParam(url, "limit", limit);
+  if (cursor) pageUrl = withParam(pageUrl, "cursor", cursor);
+
+  const res = await fetch(pageUrl, {
+    headers: {
+      Authorization: "Bearer " + token,
+    },
+  });
+  if (!res.ok) return null;
+
+  const data = await res.json();
+  return { requests: data.requests || [], next_cursor: data.next_cursor || null };
+}
+
+// Fetch the requests exchanged with the given users only (at most MAX_UIDS_PER_QUERY).
+// Returns the list, or null if any page fails.
+export async function fetchRequestsWith(url, token, uids) {
+  if (uids.length === 0) return [];
+
+  const narrowedUrl = withParam(url, "uids", uids.join(","));
+  const requests = [];
+  let cursor = null;
+
+  // Bounded by the requests with these users, not by the whole inbox
+  do {
+    const page = await fetchRequestPage(narrowedUrl, token, cursor, MAX_UIDS_PER_QUERY);
+    if (!page) return null;
+    requests.push(...page.requests);
+    cursor = page.next_cursor;
+  } while (cursor);
+
+  return requests;
+}
+
+// Merge a freshly fetched first page into a list that may hold further loaded pages:
+// the first page replaces whatever it covers, older rows loaded earlier are kept.
+export function mergeFirstPage(list, page) {
+  if (!page.next_cursor || list.requests.length <= page.requests.length) {
+    return { requests: page.requests, nextCursor: page.next_cursor };
+  }
+
+  const freshIds = new Set(page.requests.map((request) => request.id));
+  const oldest = page.requests[page.requests.length - 1];
+  const older = list.requests.filter(
+    (request) =>
+      !freshIds.has(request.id) &&
+      (request.created_at < oldest.created_at ||
+        (request.created_at === oldest.created_at && request.id < oldest.id))
+  );
+  return { requests: [...page.requests, ...older], nextCursor: list.nextCursor };
+}